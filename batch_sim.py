@@ -0,0 +1,213 @@
+"""Play many headless Road Rage games in parallel, for difficulty tuning.
+
+Every worker process builds one headless Game, loading the assets once,
+and plays each game it is handed from a fresh start with that game's own
+seed. The per-game results are collected into columns (one list per
+field) and written as JSON or CSV:
+
+    python batch_sim.py --games 5000 --policy dodge --output dodge.csv
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+import pygame
+
+from main import Game
+
+COLUMNS = ('seed', 'score', 'passed', 'level', 'lives_lost', 'death_cause', 'ticks')
+
+
+class IdlePolicy:
+    """Never touches the controls."""
+
+    def __init__(self, seed):
+        pass
+
+    def __call__(self, game):
+        return ()
+
+
+class RandomPolicy:
+    """Holds a random direction for a random while and fires now and then."""
+    KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.held = None
+        self.hold_ticks = 0
+
+    def __call__(self, game):
+        events = []
+        self.hold_ticks -= 1
+        if self.hold_ticks <= 0:
+            if self.held is not None:
+                events.append(pygame.event.Event(pygame.KEYUP, key=self.held))
+            self.held = self.rng.choice(self.KEYS + (None,))
+            if self.held is not None:
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=self.held))
+            self.hold_ticks = self.rng.randrange(5, 60)
+        if self.rng.random() < 0.02:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+        return events
+
+
+class DodgePolicy:
+    """Steers away from the nearest obstacle ahead and shoots at it."""
+    LOOKAHEAD = 300
+
+    def __init__(self, seed):
+        self.held = None
+        self.cooldown = 0
+
+    def steer(self, key):
+        events = []
+        if key != self.held:
+            if self.held is not None:
+                events.append(pygame.event.Event(pygame.KEYUP, key=self.held))
+            if key is not None:
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=key))
+            self.held = key
+        return events
+
+    def __call__(self, game):
+        player = game.player
+        centre = player.x + player.width / 2
+        threat = None
+        for obstacle in game.obstacles:
+            ahead = player.y - (obstacle.y + obstacle.height)
+            overlaps = obstacle.x < player.x + player.width + 20 and player.x - 20 < obstacle.x + obstacle.width
+            if 0 <= ahead < self.LOOKAHEAD and overlaps and (threat is None or obstacle.y > threat.y):
+                threat = obstacle
+
+        key = None
+        if threat is not None:
+            # Go round whichever side of the threat has more road.
+            key = pygame.K_LEFT if threat.x + threat.width / 2 > centre else pygame.K_RIGHT
+            if key == pygame.K_LEFT and player.x <= game.display_width * 0.15:
+                key = pygame.K_RIGHT
+            elif key == pygame.K_RIGHT and player.x + player.width >= game.display_width * 0.85:
+                key = pygame.K_LEFT
+        events = self.steer(key)
+
+        self.cooldown -= 1
+        if threat is not None and self.cooldown <= 0:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+            self.cooldown = 15
+        return events
+
+
+POLICIES = {'idle': IdlePolicy, 'random': RandomPolicy, 'dodge': DodgePolicy}
+
+# Each worker process keeps one game around and reuses it for every task.
+_worker_game = None
+_worker_options = None
+
+
+def init_worker(options):
+    global _worker_game, _worker_options
+    _worker_options = options
+    _worker_game = Game(headless=True, entity_arrays=options['entity_arrays'], swarm=options['swarm'])
+
+
+def play(seed):
+    """Play the game for ``seed`` in this worker and return its result row."""
+    game = _worker_game
+    policy = POLICIES[_worker_options['policy']](seed)
+    ticks = game.run_headless(_worker_options['max_ticks'], policy, seed=seed)
+    return {
+        'seed': seed,
+        'score': game.score,
+        'passed': game.passed,
+        'level': game.level,
+        'lives_lost': game.lives_lost,
+        'death_cause': game.death_cause or 'survived',
+        'ticks': ticks,
+    }
+
+
+def run_batch(seeds, policy='dodge', max_ticks=36000, processes=None, entity_arrays=False, swarm=False):
+    """Play a game per seed across a process pool and return the results as columns."""
+    options = {'policy': policy, 'max_ticks': max_ticks, 'entity_arrays': entity_arrays, 'swarm': swarm}
+    processes = processes or os.cpu_count()
+    # Small chunks keep workers busy when some games last much longer than others.
+    chunksize = max(1, len(seeds) // (processes * 8))
+    columns = {name: [] for name in COLUMNS}
+    pool = multiprocessing.Pool(processes, initializer=init_worker, initargs=(options,))
+    try:
+        rows = sorted(pool.imap_unordered(play, seeds, chunksize), key=lambda row: row['seed'])
+    finally:
+        # Not terminate(): pygame's signal handling keeps SIGTERM from stopping the workers.
+        pool.close()
+        pool.join()
+    for row in rows:
+        for name in COLUMNS:
+            columns[name].append(row[name])
+    return columns
+
+
+def write_columns(columns, path):
+    if path.endswith('.csv'):
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            writer.writerows(zip(*(columns[name] for name in COLUMNS)))
+    else:
+        with open(path, 'w') as f:
+            json.dump(columns, f)
+
+
+def summarize(columns):
+    games = len(columns['seed'])
+    scores = sorted(columns['score'])
+    print(f"{games} games: mean score {sum(scores) / games:.1f}, median {scores[games // 2]}, "
+          f"max {scores[-1]}, mean passed {sum(columns['passed']) / games:.1f}")
+    levels = Counter(columns['level'])
+    print("levels reached: " + ", ".join(f"{level}: {levels[level]}" for level in sorted(levels)))
+    causes = Counter(columns['death_cause'])
+    print("death causes: " + ", ".join(f"{cause}: {count}" for cause, count in causes.most_common()))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Road Rage batch simulator")
+    parser.add_argument('--games', type=int, default=1000,
+                        help="number of games to play (default: %(default)s)")
+    parser.add_argument('--first-seed', type=int, default=0,
+                        help="seed of the first game; the rest follow on (default: %(default)s)")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='dodge',
+                        help="how the games are played (default: %(default)s)")
+    parser.add_argument('--max-ticks', type=int, default=36000,
+                        help="give up on a game after this many ticks (default: %(default)s)")
+    parser.add_argument('--processes', type=int,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument('--entity-arrays', action='store_true',
+                        help="keep obstacles, bullets and power-ups in NumPy arrays")
+    parser.add_argument('--swarm', action='store_true',
+                        help="play swarm mode games")
+    parser.add_argument('--output', metavar='FILE', default='batch_results.json',
+                        help="results file, CSV if it ends in .csv, otherwise JSON columns (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    seeds = list(range(args.first_seed, args.first_seed + args.games))
+    start = time.perf_counter()
+    columns = run_batch(seeds, args.policy, args.max_ticks, args.processes, args.entity_arrays, args.swarm)
+    elapsed = time.perf_counter() - start
+    write_columns(columns, args.output)
+    summarize(columns)
+    ticks = sum(columns['ticks'])
+    print(f"{ticks} ticks in {elapsed:.1f}s ({ticks / elapsed:.0f} ticks/s); results written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
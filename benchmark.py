@@ -0,0 +1,347 @@
+"""Frame cost benchmarks for Road Rage.
+
+Drives headless games through scripted scenarios at increasing entity
+counts and times every stage of a frame: the whole update, the three
+collision passes inside it, drawing, and presenting the frame. Results are
+written as JSON so runs from different commits can be compared:
+
+    python benchmark.py --output before.json
+    python benchmark.py --output after.json --compare before.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+import pygame
+
+from main import (Game, Bullet, EnemyBullet, Explosion, np, SWARM_MAX_OBSTACLES,
+                  SWARM_OBSTACLES_PER_LEVEL)
+
+ENTITY_COUNTS = (1, 10, 100, 1000)
+WARMUP_TICKS = 20
+# A 60 fps frame, which scenarios with a budget must stay inside
+FRAME_BUDGET_MS = 1000 / 60
+STAGES = ('update', 'check_crash', 'check_bullet_collisions', 'resolve_bullet_hits', 'draw', 'flip')
+
+
+class StageTimer:
+    """Wraps a game's methods so each call adds to its stage's time for the tick."""
+
+    def __init__(self, game):
+        self.game = game
+        self.current = dict.fromkeys(STAGES, 0.0)
+        self.samples = {stage: [] for stage in STAGES}
+        for stage in ('update', 'check_crash', 'check_bullet_collisions', 'resolve_bullet_hits'):
+            setattr(game, stage, self.wrap(stage, getattr(game, stage)))
+
+    def wrap(self, stage, func):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.current[stage] += time.perf_counter() - start
+        return timed
+
+    def run(self, stage, func):
+        self.wrap(stage, func)()
+
+    def end_tick(self, record=True):
+        if record:
+            for stage, seconds in self.current.items():
+                self.samples[stage].append(seconds)
+        self.current = dict.fromkeys(STAGES, 0.0)
+
+    def summary(self):
+        """Per-stage timings in microseconds, skipping stages that never ran."""
+        result = {}
+        for stage, samples in self.samples.items():
+            if not samples or not any(samples):
+                continue
+            ordered = sorted(samples)
+            result[stage] = {
+                'mean_us': round(statistics.fmean(ordered) * 1e6, 2),
+                'median_us': round(statistics.median(ordered) * 1e6, 2),
+                'p95_us': round(ordered[int(len(ordered) * 0.95) - 1] * 1e6, 2),
+                'max_us': round(ordered[-1] * 1e6, 2),
+            }
+        return result
+
+
+class Scenario:
+    """A scripted situation to time.
+
+    ``setup`` prepares a freshly started game and ``tick`` tops it back up to
+    ``count`` entities before every frame. Scenarios that don't scale run
+    once with a count of 0. ``game_options`` are passed to the Game, and a
+    scenario with ``budgeted`` set fails the run if its median frame takes
+    longer than FRAME_BUDGET_MS.
+    """
+    scales = True
+    playing = True
+    budgeted = False
+    game_options = {}
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def setup(self, game, count):
+        pass
+
+    def tick(self, game, count):
+        pass
+
+    def draw(self, game):
+        game.draw_frame()
+
+
+class EmptyRoad(Scenario):
+    """Just the player and the scrolling road."""
+    name = 'empty_road'
+    scales = False
+
+    def setup(self, game, count):
+        game.get_max_obstacles = lambda: 0
+        game.remove_entities(game.obstacles, list(game.obstacles))
+
+
+class MaxObstacles(Scenario):
+    """``count`` shooting obstacles at level 8."""
+    name = 'max_obstacles'
+
+    def setup(self, game, count):
+        game.level = 8
+        game.get_max_obstacles = lambda: count
+
+    def tick(self, game, count):
+        while len(game.obstacles) < count:
+            game.obstacles.append(game.obstacle_class(game))
+
+
+class Volley(Scenario):
+    """``count`` player bullets in flight through the normal game's traffic."""
+    name = 'volley'
+
+    def setup(self, game, count):
+        game.level = 8
+
+    def tick(self, game, count):
+        while len(game.bullets) < count:
+            x = self.rng.randrange(game.display_width)
+            game.bullets.append(game.spawn(Bullet, x, self.rng.randrange(game.display_height)))
+
+
+class BulletSpam(Scenario):
+    """``count`` player bullets and ``count`` enemy bullets in flight."""
+    name = 'bullet_spam'
+
+    def setup(self, game, count):
+        game.level = 8
+
+    def tick(self, game, count):
+        while len(game.bullets) < count:
+            x = self.rng.randrange(game.display_width)
+            game.bullets.append(game.spawn(Bullet, x, self.rng.randrange(game.display_height)))
+        while len(game.enemy_bullets) < count:
+            x = self.rng.randrange(game.display_width)
+            game.enemy_bullets.append(game.spawn(EnemyBullet, x, self.rng.randrange(game.display_height), 0, 10))
+
+
+class Explosions(Scenario):
+    """``count`` explosions on screen at once."""
+    name = 'explosions'
+
+    def tick(self, game, count):
+        while len(game.explosions) < count:
+            x = self.rng.randrange(game.display_width - 100)
+            game.explosions.append(game.spawn(Explosion, x, self.rng.randrange(game.display_height - 100)))
+
+
+class Swarm(Scenario):
+    """Swarm mode with its whole obstacle budget on the road and shooting."""
+    name = 'swarm'
+    scales = False
+    budgeted = True
+    game_options = {'swarm': True}
+
+    def setup(self, game, count):
+        game.level = math.ceil(SWARM_MAX_OBSTACLES / SWARM_OBSTACLES_PER_LEVEL)
+        # Spread the cars down the road rather than waiting for rows to arrive;
+        # after that, recycling keeps the count where it is.
+        while len(game.obstacles) < game.get_max_obstacles():
+            obstacle = game.obstacle_class(game)
+            obstacle.y = self.rng.randrange(-600, game.display_height)
+            obstacle.snapshot()
+            game.obstacles.append(obstacle)
+
+
+class Menus(Scenario):
+    """The intro, instructions, pause and game over screens in turn."""
+    name = 'menus'
+    scales = False
+    playing = False
+
+    def setup(self, game, count):
+        # The pause and game over screens show a game's figures.
+        game.new_game()
+        self.screens = [game.draw_intro, game.draw_instructions, game.draw_paused, game.draw_game_over]
+        self.frame = 0
+
+    def draw(self, game):
+        self.screens[self.frame % len(self.screens)]()
+        self.frame += 1
+
+
+SCENARIOS = (EmptyRoad, MaxObstacles, Volley, BulletSpam, Explosions, Swarm, Menus)
+
+
+def entity_counts(game):
+    return {
+        'obstacles': len(game.obstacles),
+        'bullets': len(game.bullets),
+        'enemy_bullets': len(game.enemy_bullets),
+        'explosions': len(game.explosions),
+        'powerups': len(game.powerups),
+    }
+
+
+def run_scenario(scenario_cls, count, ticks, entity_arrays=False, seed=0):
+    scenario = scenario_cls(random.Random(seed))
+    game = Game(headless=True, entity_arrays=entity_arrays, seed=seed, **scenario.game_options)
+    # The off-screen frame is presented to a real-sized (dummy) window.
+    window = pygame.display.set_mode(game.gamedisplays.get_size())
+    # Nothing may end the run early, so crashes and hits are ignored.
+    game.handle_crash = lambda: None
+    game.handle_player_hit_by_bullet = lambda: None
+    if scenario.playing:
+        game.start_game(seed)
+        game.update()
+    scenario.setup(game, count)
+    timer = StageTimer(game)
+
+    def flip():
+        window.blit(game.gamedisplays, (0, 0))
+        pygame.display.flip()
+
+    totals = dict.fromkeys(entity_counts(game), 0)
+    for tick in range(WARMUP_TICKS + ticks):
+        scenario.tick(game, count)
+        if scenario.playing:
+            game.update()
+        timer.run('draw', lambda: scenario.draw(game))
+        timer.run('flip', flip)
+        timer.end_tick(record=tick >= WARMUP_TICKS)
+        if tick >= WARMUP_TICKS:
+            for name, value in entity_counts(game).items():
+                totals[name] += value
+
+    return {
+        'scenario': scenario.name,
+        'count': count,
+        'budgeted': scenario.budgeted,
+        'stages': timer.summary(),
+        'mean_entities': {name: round(value / ticks, 1) for name, value in totals.items()},
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """Print how each stage's median moved against ``baseline``; returns the regressions."""
+    old = {(r['scenario'], r['count']): r['stages'] for r in baseline['results']}
+    regressions = []
+    for result in results['results']:
+        key = (result['scenario'], result['count'])
+        if key not in old:
+            continue
+        for stage, timing in result['stages'].items():
+            before = old[key].get(stage)
+            if not before or not before['median_us']:
+                continue
+            change = timing['median_us'] / before['median_us'] - 1
+            flag = ''
+            if change > threshold:
+                flag = '  REGRESSION'
+                regressions.append((key, stage, change))
+            print(f"{key[0]:>14} {key[1]:>5} {stage:>24}: {before['median_us']:10.1f} -> "
+                  f"{timing['median_us']:10.1f} us ({change:+.0%}){flag}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Road Rage frame cost benchmarks")
+    parser.add_argument('--ticks', type=int, default=200,
+                        help="timed frames per scenario and count (default: %(default)s)")
+    parser.add_argument('--counts', type=int, nargs='+', default=ENTITY_COUNTS,
+                        help="entity counts to run the scaling scenarios at (default: 1 10 100 1000)")
+    parser.add_argument('--scenarios', nargs='+', choices=[s.name for s in SCENARIOS],
+                        help="only run these scenarios")
+    parser.add_argument('--entity-arrays', action='store_true',
+                        help="keep obstacles, bullets and power-ups in NumPy arrays")
+    parser.add_argument('--output', metavar='FILE', default='benchmark.json',
+                        help="where to write the JSON results (default: %(default)s)")
+    parser.add_argument('--compare', metavar='FILE',
+                        help="compare against earlier results and exit non-zero on regressions")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="median slowdown that counts as a regression (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'numpy': np.__version__ if np is not None else None,
+            'platform': platform.platform(),
+            'entity_arrays': args.entity_arrays,
+            'ticks': args.ticks,
+        },
+        'results': [],
+    }
+    over_budget = []
+    for scenario_cls in SCENARIOS:
+        if args.scenarios and scenario_cls.name not in args.scenarios:
+            continue
+        for count in (args.counts if scenario_cls.scales else (0,)):
+            result = run_scenario(scenario_cls, count, args.ticks, args.entity_arrays)
+            results['results'].append(result)
+            frame = sum(result['stages'][stage]['median_us'] for stage in ('update', 'draw', 'flip')
+                        if stage in result['stages'])
+            flag = ''
+            if scenario_cls.budgeted and frame / 1000 > FRAME_BUDGET_MS:
+                flag = f"  OVER {FRAME_BUDGET_MS:.1f} ms BUDGET"
+                over_budget.append(result['scenario'])
+            print(f"{result['scenario']:>14} {count:>5}: {frame / 1000:7.2f} ms/frame (median){flag}")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""Gym-style environments for training driving agents on Road Rage.
+
+RoadRageEnv wraps one headless Game with the usual ``reset``/``step``
+interface; VectorRoadRageEnv steps several games in lockstep and returns
+batched observations so an agent can run inference on all of them at
+once. Observations are either a fixed-size state vector or the rendered
+frame. Frames are read straight out of the memory the game draws into,
+so they cost no copies: the array a step returns is overwritten by the
+next step.
+"""
+import os
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+import numpy as np
+import pygame
+
+from main import DISPLAY_HEIGHT, DISPLAY_WIDTH, Game
+
+# Discrete actions. Directions are held until another action replaces
+# them; the rest are single key presses.
+NOOP, LEFT, RIGHT, UP, DOWN, FIRE, ACCELERATE, BRAKE = range(8)
+ACTION_NAMES = ('noop', 'left', 'right', 'up', 'down', 'fire', 'accelerate', 'brake')
+HELD_KEYS = {LEFT: pygame.K_LEFT, RIGHT: pygame.K_RIGHT, UP: pygame.K_UP, DOWN: pygame.K_DOWN}
+PRESSED_KEYS = {FIRE: pygame.K_SPACE, ACCELERATE: pygame.K_d, BRAKE: pygame.K_a}
+
+# Slots in the state vector; the nearest entities fill them first.
+OBSTACLE_SLOTS = 8
+BULLET_SLOTS = 8
+PLAYER_FEATURES = 5
+OBSTACLE_FEATURES = 5
+BULLET_FEATURES = 5
+POWERUP_FEATURES = 3
+STATE_SIZE = (PLAYER_FEATURES + OBSTACLE_SLOTS * OBSTACLE_FEATURES
+              + BULLET_SLOTS * BULLET_FEATURES + POWERUP_FEATURES)
+LIFE_PENALTY = 100
+
+
+def frame_buffer(shape):
+    """Allocate BGRA frame memory that games can draw into and NumPy can read."""
+    return np.zeros(shape + (4,), dtype=np.uint8)
+
+
+class RoadRageEnv:
+    """One headless game behind a Gym-style interface.
+
+    ``obs_type`` is ``'state'`` for a float32 vector of ``STATE_SIZE``
+    values, or ``'pixels'`` for the rendered frame as a height x width x 3
+    RGB view. ``frame_skip`` repeats each action for that many ticks, and
+    ``max_steps`` truncates episodes. Rewards are the points scored, less
+    ``LIFE_PENALTY`` for every life lost.
+    """
+
+    def __init__(self, obs_type='state', frame_skip=1, max_steps=None, entity_arrays=False, frame=None):
+        if obs_type not in ('state', 'pixels'):
+            raise ValueError(f"unknown obs_type {obs_type!r}")
+        self.obs_type = obs_type
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.game = Game(headless=True, entity_arrays=entity_arrays)
+        self.num_actions = len(ACTION_NAMES)
+        self.state = np.zeros(STATE_SIZE, dtype=np.float32)
+        if obs_type == 'pixels':
+            # The game draws straight into this buffer, so observing a frame
+            # is only a matter of slicing it.
+            size = (self.game.display_height, self.game.display_width)
+            self.frame = frame if frame is not None else frame_buffer(size)
+            self.game.gamedisplays = pygame.image.frombuffer(self.frame, size[::-1], 'BGRA')
+            self.pixels = self.frame[..., 2::-1]
+        self.held = None
+        self.steps = 0
+
+    def reset(self, seed=None):
+        """Start a new game and return ``(observation, info)``."""
+        self.game.start_game(seed)
+        # Headless games have no countdown, so one tick gets into play.
+        self.game.step(render=self.obs_type == 'pixels')
+        self.held = None
+        self.steps = 0
+        return self.observe(), self.info()
+
+    def step(self, action):
+        """Apply ``action`` and return ``(observation, reward, terminated, truncated, info)``."""
+        game = self.game
+        score, lives_lost = game.score, game.lives_lost
+        events = self.action_events(action)
+        render = self.obs_type == 'pixels'
+        for tick in range(self.frame_skip):
+            game.step(events if tick == 0 else (), render=render and tick == self.frame_skip - 1)
+            if game.game_state == 'GAME_OVER':
+                break
+        self.steps += 1
+        reward = game.score - score - LIFE_PENALTY * (game.lives_lost - lives_lost)
+        terminated = game.game_state == 'GAME_OVER'
+        truncated = not terminated and self.max_steps is not None and self.steps >= self.max_steps
+        return self.observe(), reward, terminated, truncated, self.info()
+
+    def action_events(self, action):
+        events = []
+        held = HELD_KEYS.get(action, self.held if action in PRESSED_KEYS else None)
+        if held != self.held:
+            if self.held is not None:
+                events.append(pygame.event.Event(pygame.KEYUP, key=self.held))
+            if held is not None:
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=held))
+            self.held = held
+        if action in PRESSED_KEYS:
+            key = PRESSED_KEYS[action]
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=key))
+            events.append(pygame.event.Event(pygame.KEYUP, key=key))
+        return events
+
+    def observe(self):
+        if self.obs_type == 'pixels':
+            return self.pixels
+        self.write_state(self.state)
+        return self.state
+
+    def write_state(self, out):
+        """Fill ``out`` with the state vector, positions relative to the player."""
+        game = self.game
+        player = game.player
+        width, height = game.display_width, game.display_height
+        px = player.x + player.width / 2
+        py = player.y + player.height / 2
+        out[:] = 0
+        out[:PLAYER_FEATURES] = (px / width, py / height, player.shield_hits / 8,
+                                 float(player.power_up_active), game.speed_offset / 16)
+        i = PLAYER_FEATURES
+
+        nearest = sorted(game.obstacles, key=lambda o: abs(o.x + o.width / 2 - px) + abs(o.y + o.height / 2 - py))
+        for obstacle in nearest[:OBSTACLE_SLOTS]:
+            out[i:i + OBSTACLE_FEATURES] = (1.0, (obstacle.x + obstacle.width / 2 - px) / width,
+                                            (obstacle.y + obstacle.height / 2 - py) / height,
+                                            obstacle.x_change, (obstacle.base_speed + game.speed_offset) / 20)
+            i += OBSTACLE_FEATURES
+        i = PLAYER_FEATURES + OBSTACLE_SLOTS * OBSTACLE_FEATURES
+
+        nearest = sorted(game.enemy_bullets, key=lambda b: abs(b.x - px) + abs(b.y - py))
+        for bullet in nearest[:BULLET_SLOTS]:
+            out[i:i + BULLET_FEATURES] = (1.0, (bullet.x - px) / width, (bullet.y - py) / height,
+                                          bullet.speed_x / 10, bullet.speed_y / 10)
+            i += BULLET_FEATURES
+        i = STATE_SIZE - POWERUP_FEATURES
+
+        for powerup in game.powerups:
+            out[i:i + POWERUP_FEATURES] = (1.0, (powerup.x - px) / width, (powerup.y - py) / height)
+            break
+
+    def info(self):
+        game = self.game
+        return {'score': game.score, 'passed': game.passed, 'level': game.level, 'lives': game.lives,
+                'seed': game.seed, 'death_cause': game.death_cause}
+
+
+class VectorRoadRageEnv:
+    """``num_envs`` games stepped in lockstep with batched observations.
+
+    Observations come back as one array with a leading ``num_envs`` axis:
+    the state vectors are written into a shared float32 array, and the
+    games' frames all live in one buffer, so neither is gathered or copied.
+    Finished games are reset straight away; the ``info`` for that step
+    carries the finished game's ``final_info``.
+    """
+
+    def __init__(self, num_envs, obs_type='state', frame_skip=1, max_steps=None, entity_arrays=False):
+        self.num_envs = num_envs
+        self.obs_type = obs_type
+        if obs_type == 'pixels':
+            frames = frame_buffer((num_envs, DISPLAY_HEIGHT, DISPLAY_WIDTH))
+        self.envs = [RoadRageEnv(obs_type, frame_skip, max_steps, entity_arrays,
+                                 frame=frames[i] if obs_type == 'pixels' else None)
+                     for i in range(num_envs)]
+        self.num_actions = self.envs[0].num_actions
+        if obs_type == 'pixels':
+            self.observations = frames[..., 2::-1]
+        else:
+            self.observations = np.zeros((num_envs, STATE_SIZE), dtype=np.float32)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.terminated = np.zeros(num_envs, dtype=bool)
+        self.truncated = np.zeros(num_envs, dtype=bool)
+
+    def reset(self, seed=None):
+        """Reset every game; game ``i`` gets ``seed + i`` when a seed is given."""
+        infos = []
+        for i, env in enumerate(self.envs):
+            _, info = env.reset(None if seed is None else seed + i)
+            self.write_observation(i)
+            infos.append(info)
+        return self.observations, infos
+
+    def step(self, actions):
+        infos = []
+        for i, (env, action) in enumerate(zip(self.envs, actions)):
+            _, reward, terminated, truncated, info = env.step(int(action))
+            if terminated or truncated:
+                _, reset_info = env.reset()
+                info = dict(reset_info, final_info=info)
+            self.write_observation(i)
+            self.rewards[i] = reward
+            self.terminated[i] = terminated
+            self.truncated[i] = truncated
+            infos.append(info)
+        return self.observations, self.rewards, self.terminated, self.truncated, infos
+
+    def write_observation(self, i):
+        if self.obs_type == 'state':
+            self.envs[i].write_state(self.observations[i])
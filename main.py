@@ -1,18 +1,85 @@
+import argparse
+import hashlib
+import heapq
+import itertools
+import os
+import struct
+from concurrent.futures import Future, ThreadPoolExecutor
 import pygame
 import sys
 import time
 import random
 import math
+import queue
+import sqlite3
+import threading
+from collections import OrderedDict, deque
+import json
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # Constants
 DISPLAY_WIDTH = 800
 DISPLAY_HEIGHT = 800
 CAR_WIDTH = 56
 HIGHSCORE_FILE = "highscore.txt"
+LEADERBOARD_FILE = "leaderboard.db"
+# Runs listed on the intro and game over screens.
+LEADERBOARD_SIZE = 5
+
+# Simulation rate. Speeds are in pixels per tick and tuned for 60 ticks/s.
+TICK_RATE = 60
+MAX_FPS = 60
+# Longest frame the fixed-timestep loop will catch up on.
+MAX_FRAME_SECONDS = 0.25
+# How long the timed screens between gameplay stretches last, in seconds.
+TRANSITION_SECONDS = {'COUNTDOWN': 4, 'LEVEL_UP': 2, 'CRASHED': 2}
+ASSET_CACHE_DIR = ".asset_cache"
+ASSET_LOADER_THREADS = 4
+# No image needs more pixels than the screen has; larger sources loaded at
+# their own size are downsampled to this many when decoded.
+MAX_SURFACE_PIXELS = 800 * 800
+# Car images sit on a flat border; pixels this close to the corner colour
+# are border and left out of the collision masks.
+MASK_TOLERANCE = 14
+OBSTACLE_CAR_FILES = ("car.jpg", "car1.jpg", "car2.jpg", "car4.jpg", "car5.jpg", "car6.jpg", "car7.jpg")
+SOUND_FILES = {
+    'engine': 'engine.mp3',
+    'crash': 'crash.mp3',
+    'horn': 'horn.mp3',
+    'breaks': 'breaks.mp3',
+    'beep': 'beep.mp3',
+    'go': 'go.mp3',
+    'engine2': 'engine2.mp3',
+    'gun': 'gun.mp3',
+    'explosion': 'explosion.mp3',
+    'powerup': 'power up.mp3',
+}
+MUSIC_FILE = 'Car Chase.mp3'
+# Mixer channels; channel 0 is kept for the engine loop.
+MIXER_CHANNELS = 8
+ENGINE_CHANNEL = 0
+# Most voices each sound may have at once, and its priority when every
+# channel is busy (a sound can take over voices of equal or lower priority).
+SOUND_VOICES = {
+    'gun': (2, 0),
+    'engine2': (1, 1),
+    'breaks': (1, 1),
+    'horn': (1, 1),
+    'explosion': (3, 2),
+    'crash': (1, 3),
+    'powerup': (1, 3),
+    'beep': (1, 3),
+    'go': (1, 3),
+}
 
 # Colors
 GRAY = (119, 118, 110)
 BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
 RED = (255, 0, 0)
 GREEN = (0, 200, 0)
 BLUE = (0, 0, 200)
@@ -21,111 +88,1428 @@ BRIGHT_RED = (255, 0, 0)
 BRIGHT_GREEN = (0, 255, 0)
 BRIGHT_BLUE = (0, 0, 255)
 
-class Game:
+# Road bounds and collision grid
+ROAD_LEFT = 110
+ROAD_RIGHT = 690
+GRID_CELL_SIZE = 64
+# Groups this small are tested rect by rect instead of bucketed into cells.
+GRID_MIN_ENTITIES = 16
+
+# Keys recorded for replays, in the order of their codes. P is left out:
+# pausing stops the simulation rather than changing it.
+RECORDED_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+                 pygame.K_d, pygame.K_a, pygame.K_LSHIFT, pygame.K_SPACE)
+
+STARTING_LIVES = 4
+
+# Average power-ups per second of play while none is on the road
+# (about 1% a tick at 60 ticks/s).
+POWERUP_SPAWN_RATE = 0.6
+POWERUP_SECONDS = 7
+EXPLOSION_SECONDS = 0.5
+
+# Preallocated objects per pooled entity type
+POOL_CAPACITY = {'Bullet': 256, 'EnemyBullet': 128, 'Explosion': 32, 'PowerUp': 4}
+
+# Adaptive quality drops a level while the last QUALITY_WINDOW frames
+# average over the frame budget, and gets one back once the last
+# QUALITY_RESTORE_FRAMES have averaged under QUALITY_HEADROOM of it.
+QUALITY_LEVELS = ('minimal', 'low', 'medium', 'high', 'full')
+QUALITY_WINDOW = 30
+QUALITY_RESTORE_FRAMES = 120
+QUALITY_HEADROOM = 0.6
+# Below full quality the HUD and speedometer are redrawn this often.
+HUD_REFRESH_FRAMES = 6
+SPEEDOMETER_SIZE = 104
+HUD_TEXT_POS = (0, 30)
+HUD_TEXT_SIZE = (250, 100)
+
+# Obstacles passed per level in the normal game
+PASSES_PER_LEVEL = 50
+
+# Swarm mode sends rows of traffic down SWARM_LANES lanes, one lane left
+# open, and every car shoots from the first level. Each level allows
+# SWARM_OBSTACLES_PER_LEVEL more cars on the road, up to the entity budget
+# of SWARM_MAX_OBSTACLES, which the game holds at 60 fps with the enemy
+# fire that comes with it (benchmark.py's swarm scenario checks this).
+SWARM_LANES = 8
+SWARM_ROW_SECONDS = 0.5
+SWARM_OBSTACLES_PER_LEVEL = 28
+SWARM_MAX_OBSTACLES = 200
+SWARM_PASSES_PER_LEVEL = 250
+LANES_LEFT = 120
+
+class StoredField:
+    """Entity attribute that lives in an EntityStore column while attached.
+
+    Detached entities keep the value on the instance under ``_<name>``.
+    """
+
+    def __init__(self, column):
+        self.column = column
+
+    def __set_name__(self, owner, name):
+        self.attr = '_' + name
+
+    def __get__(self, entity, owner=None):
+        if entity is None:
+            return self
+        store = entity._store
+        if store is None:
+            return getattr(entity, self.attr)
+        return store.columns[self.column][entity._index]
+
+    def __set__(self, entity, value):
+        store = entity._store
+        if store is None:
+            setattr(entity, self.attr, value)
+        else:
+            store.columns[self.column][entity._index] = value
+
+
+class Interpolated:
+    """Mixin for entities drawn between their positions at the last two ticks."""
+    __slots__ = ()
+
+    def snapshot(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    def render_pos(self):
+        alpha = self.game.render_alpha
+        if alpha >= 1.0:
+            return self.x, self.y
+        prev_x = self.prev_x
+        prev_y = self.prev_y
+        return prev_x + (self.x - prev_x) * alpha, prev_y + (self.y - prev_y) * alpha
+
+
+class StoredEntity:
+    """Base for entities whose hot fields can move into an EntityStore.
+
+    ``STORED`` maps those attribute names to store columns. The class itself
+    keeps them as plain attributes, which is all list mode needs; array mode
+    uses the subclass from ``stored()``, where they are StoredFields.
+    Subclasses must set ``_store = None`` before assigning stored fields.
+    """
+    __slots__ = ('_store', '_index')
+    STORED = {}
+    _fields_cache = {}
+    _stored_classes = {}
+
+    @classmethod
+    def stored(cls):
+        """The subclass of ``cls`` whose STORED attributes can live in an EntityStore."""
+        stored_cls = StoredEntity._stored_classes.get(cls)
+        if stored_cls is None:
+            namespace = {name: StoredField(column) for name, column in cls.STORED.items()}
+            namespace['__slots__'] = tuple('_' + name for name in cls.STORED)
+            namespace['__module__'] = cls.__module__
+            stored_cls = type(cls.__name__, (cls,), namespace)
+            StoredEntity._stored_classes[cls] = stored_cls
+        return stored_cls
+
+    @classmethod
+    def stored_fields(cls):
+        fields = StoredEntity._fields_cache.get(cls)
+        if fields is None:
+            fields = []
+            for klass in reversed(cls.__mro__):
+                fields.extend(v for v in vars(klass).values() if isinstance(v, StoredField))
+            StoredEntity._fields_cache[cls] = fields
+        return fields
+
+
+class EntityStore:
+    """Struct-of-arrays storage for one group of entities.
+
+    Stands in for the plain list a group normally lives in (append, remove,
+    iteration, ``in`` and slicing all work), but keeps positions, velocities
+    and flags in contiguous NumPy columns so a whole group can be moved,
+    bounced and culled with a few vectorized operations per frame.
+    """
+    COLUMNS = ('x', 'y', 'px', 'py', 'vx', 'vy', 'w', 'flag')
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.entities = []
+        self.columns = {name: np.zeros(capacity) for name in self.COLUMNS}
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.entities)
+
+    def __contains__(self, entity):
+        return entity._store is self
+
+    def __getitem__(self, index):
+        return self.entities[index]
+
+    def view(self, column):
+        return self.columns[column][:self.count]
+
+    def append(self, entity):
+        if self.count == len(self.columns['x']):
+            for name, column in self.columns.items():
+                self.columns[name] = np.concatenate((column, np.zeros(len(column))))
+        index = self.count
+        for name in self.COLUMNS:
+            self.columns[name][index] = 0
+        for field in entity.stored_fields():
+            self.columns[field.column][index] = getattr(entity, field.attr)
+        entity._store = self
+        entity._index = index
+        self.entities.append(entity)
+        self.count += 1
+
+    def remove(self, entity):
+        if entity._store is not self:
+            raise ValueError("entity is not in this store")
+        index = entity._index
+        self._detach(entity)
+        # Later rows move down one, so the group keeps the order a list would.
+        last = self.count - 1
+        for column in self.columns.values():
+            column[index:last] = column[index + 1:self.count]
+        del self.entities[index]
+        for index in range(index, last):
+            self.entities[index]._index = index
+        self.count = last
+
+    def compact(self, keep):
+        """Drop every entity whose entry in the boolean mask ``keep`` is false.
+
+        The entities kept stay in order. Returns the removed entities.
+        """
+        removed = [self.entities[index] for index in np.flatnonzero(~keep)]
+        if not removed:
+            return removed
+        for entity in removed:
+            self._detach(entity)
+        kept = np.flatnonzero(keep)
+        self.count = len(kept)
+        for column in self.columns.values():
+            column[:self.count] = column[kept]
+        self.entities = [self.entities[index] for index in kept]
+        for index, entity in enumerate(self.entities):
+            entity._index = index
+        return removed
+
+    def _detach(self, entity):
+        """Copy the entity's row back into its attributes."""
+        index = entity._index
+        for field in entity.stored_fields():
+            setattr(entity, field.attr, self.columns[field.column][index].item())
+        entity._store = None
+        entity._index = -1
+
+
+class CollisionGrid:
+    """Uniform-grid broadphase over the road area.
+
+    ``build`` takes a snapshot of a group's rects once per tick; ``query``
+    then only narrow-phase tests the entities sharing a cell with the probe
+    rect, instead of every entity in the group. Groups of up to
+    GRID_MIN_ENTITIES (the normal game has one to four obstacles) skip the
+    cells, since testing their few rects directly is cheaper.
+    """
+
+    def __init__(self, cell_size=GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.columns = (ROAD_RIGHT - ROAD_LEFT) // cell_size + 1
+        self.cells = {}
+        self.rects = {}
+        self.order = {}
+        self.entities = []
+        self.rect_list = []
+        self.linear = True
+
+    def build(self, entities):
+        self.cells.clear()
+        self.rects.clear()
+        self.order.clear()
+        self.entities = list(entities)
+        self.rect_list = [entity.get_rect() for entity in self.entities]
+        self.rects.update(zip(self.entities, self.rect_list))
+        self.linear = len(self.entities) <= GRID_MIN_ENTITIES
+        if self.linear:
+            return
+        for order, (entity, rect) in enumerate(zip(self.entities, self.rect_list)):
+            self.order[entity] = order
+            for cell in self.cells_for(rect):
+                self.cells.setdefault(cell, []).append(entity)
+
+    def cells_for(self, rect):
+        size = self.cell_size
+        last_column = self.columns - 1
+        left = min(max((rect.left - ROAD_LEFT) // size, 0), last_column)
+        right = min(max((rect.right - ROAD_LEFT) // size, 0), last_column)
+        for column in range(left, right + 1):
+            for row in range(rect.top // size, rect.bottom // size + 1):
+                yield column, row
+
+    def remove(self, entity):
+        # Cell lists are rebuilt every tick, so dropping the rect is enough.
+        self.rects.pop(entity, None)
+
+    def query(self, rect):
+        """Return the entities overlapping ``rect`` in the order they were added."""
+        if not self.rects:
+            return []
+        if self.linear:
+            entities = self.entities
+            return [entities[index] for index in rect.collidelistall(self.rect_list) if entities[index] in self.rects]
+        found = set()
+        for cell in self.cells_for(rect):
+            entities = self.cells.get(cell)
+            if entities:
+                found.update(entities)
+        if not found:
+            return []
+        candidates = sorted((entity for entity in found if entity in self.rects), key=self.order.__getitem__)
+        hits = rect.collidelistall([self.rects[entity] for entity in candidates])
+        return [candidates[index] for index in hits]
+
+    def touching(self, rects):
+        """Return the indices of the ``rects`` that may overlap an entity, in order."""
+        if not self.rects:
+            return []
+        if self.linear:
+            found = set()
+            for rect in self.rect_list:
+                found.update(rect.collidelistall(rects))
+            return sorted(found)
+        return [index for index, rect in enumerate(rects) if self.query(rect)]
+
+
+class FontCache:
+    """Font registry plus a bounded LRU cache of rendered text surfaces.
+
+    Each (face, size) font is loaded once; ``face`` is a font file or None
+    for pygame's default system font. Rendered surfaces are keyed by
+    (text, font, color) and the least recently used ones are dropped once
+    ``max_surfaces`` is reached.
+    """
+
+    def __init__(self, max_surfaces=256):
+        self.max_surfaces = max_surfaces
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+
+    def get(self, face, size):
+        font = self.fonts.get((face, size))
+        if font is None:
+            font = pygame.font.SysFont(None, size) if face is None else pygame.font.Font(face, size)
+            self.fonts[(face, size)] = font
+        return font
+
+    def render(self, text, font, color):
+        key = (text, font, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_surfaces:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+
+class AssetPipeline:
+    """Loads images as display-format surfaces with an on-disk pixel cache.
+
+    Decoded (and optionally scaled) pixels are written to ``cache_dir`` as
+    raw buffers keyed by a hash of the source file and the requested size,
+    so later startups skip JPEG decoding and scaling entirely. Loaded
+    surfaces are converted to the display format once, so blits don't pay a
+    per-pixel format conversion. Sounds are cached the same way, as PCM in
+    the mixer's format, so MP3s are only decoded once.
+
+    Each source's hash is kept in an index with its size and mtime, and the
+    file is only read and hashed again when those change. Cache entries for
+    an old hash are deleted when a source changes, and at startup every
+    entry that no source in the index has the hash of is deleted.
+    """
+    HEADER = struct.Struct('<II')
+    INDEX = 'sources.json'
+
+    def __init__(self, cache_dir=ASSET_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, self.INDEX)
+        self.lock = threading.Lock()
+        try:
+            with open(self.index_path) as f:
+                self.sources = json.load(f)
+        except (OSError, ValueError):
+            self.sources = {}
+        self.prune()
+
+    def source_key(self, path):
+        """Hash of the file at ``path``, read again only if its size or mtime changed."""
+        stat = os.stat(path)
+        source = os.path.abspath(path)
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        with self.lock:
+            entry = self.sources.get(source)
+        if entry and entry[:2] == stamp:
+            return entry[2]
+
+        with open(path, 'rb') as f:
+            key = hashlib.sha1(f.read()).hexdigest()
+        with self.lock:
+            old = self.sources.get(source)
+            self.sources[source] = stamp + [key]
+            if old and old[2] != key:
+                self.prune()
+            self.store(self.index_path, json.dumps(self.sources).encode())
+        return key
+
+    def prune(self):
+        """Delete cache entries whose hash no source in the index has."""
+        self.sources = {source: entry for source, entry in self.sources.items() if os.path.exists(source)}
+        keys = {entry[2] for entry in self.sources.values()}
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if name != self.INDEX and not name.endswith('.tmp') and name.split('-', 1)[0] not in keys:
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+    def load(self, path, size=None, alpha=False, max_pixels=None):
+        surface = self.decode(path, size, alpha, max_pixels)
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def decode(self, path, size=None, alpha=False, max_pixels=None):
+        pixel_format = 'RGBA' if alpha else 'RGB'
+        key = self.source_key(path)
+        if size:
+            key += '-%dx%d' % size
+        elif max_pixels:
+            key += '-max%d' % max_pixels
+        cache_path = os.path.join(self.cache_dir, '%s-%s.raw' % (key, pixel_format))
+
+        try:
+            with open(cache_path, 'rb') as f:
+                width, height = self.HEADER.unpack(f.read(self.HEADER.size))
+                return pygame.image.frombuffer(f.read(), (width, height), pixel_format)
+        except (OSError, ValueError, struct.error):
+            pass
+
+        surface = pygame.image.load(path)
+        width, height = surface.get_size()
+        if size:
+            surface = pygame.transform.scale(surface, size)
+        elif max_pixels and width * height > max_pixels:
+            factor = math.sqrt(max_pixels / (width * height))
+            surface = pygame.transform.smoothscale(surface, (int(width * factor), int(height * factor)))
+        self.store(cache_path, self.HEADER.pack(*surface.get_size()), pygame.image.tobytes(surface, pixel_format))
+        return surface
+
+    def load_sound(self, path):
+        key = self.source_key(path)
+        # The mixer's format is part of the key, since the PCM is stored in it.
+        frequency, size, channels = pygame.mixer.get_init()
+        cache_path = os.path.join(self.cache_dir, '%s-%d-%d-%d.pcm' % (key, frequency, size, channels))
+
+        try:
+            with open(cache_path, 'rb') as f:
+                return pygame.mixer.Sound(buffer=f.read())
+        except OSError:
+            pass
+
+        sound = pygame.mixer.Sound(path)
+        self.store(cache_path, sound.get_raw())
+        return sound
+
+    def store(self, cache_path, *chunks):
+        # Write to a temporary file first so a half-written entry is never read.
+        temp_path = cache_path + '.tmp'
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            print(f"Warning: Could not cache {cache_path}. {e}")
+
+
+class SurfaceRegistry:
+    """Every image surface the game holds, each loaded or built only once.
+
+    Images are keyed by path, size and alpha, so asking for the same file
+    twice shares one surface, even from two loader threads at once.
+    Sources loaded at their own size are capped at ``max_pixels``. Surfaces
+    derived from others, such as tinted copies, are built once under a name
+    with ``derive``. ``report`` lists the pixel memory each one holds.
+    """
+
+    def __init__(self, pipeline, max_pixels=MAX_SURFACE_PIXELS):
+        self.pipeline = pipeline
+        self.max_pixels = max_pixels
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def load(self, path, size=None, alpha=False):
+        name = path if size is None else '%s@%dx%d' % ((path,) + tuple(size))
+        if alpha:
+            name += ' (alpha)'
+        return self.get(name, lambda: self.pipeline.load(path, size, alpha, self.max_pixels))
+
+    def derive(self, name, build):
+        """Return the surface registered as ``name``, calling ``build`` for it the first time."""
+        return self.get(name, build)
+
+    def get(self, name, build):
+        # The first caller builds the surface; anyone asking meanwhile waits on its Future.
+        with self.lock:
+            entry = self.entries.get(name)
+            owner = entry is None
+            if owner:
+                entry = self.entries[name] = Future()
+        if owner:
+            try:
+                entry.set_result(build())
+            except BaseException as e:
+                with self.lock:
+                    del self.entries[name]
+                entry.set_exception(e)
+        return entry.result()
+
+    def report(self):
+        """Return ``(name, size, bytes)`` for every loaded surface, largest first."""
+        rows = []
+        with self.lock:
+            entries = list(self.entries.items())
+        for name, entry in entries:
+            if entry.done() and not entry.exception():
+                surface = entry.result()
+                rows.append((name, surface.get_size(), surface.get_pitch() * surface.get_height()))
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+
+def car_mask(surface, tolerance=MASK_TOLERANCE):
+    """Collision mask of a car image without its border.
+
+    The border is whatever colour the top-left pixel is. Only the largest
+    connected blob is kept, which drops JPEG speckle left in the border.
+    """
+    background = surface.get_at((0, 0))
+    mask = pygame.mask.from_threshold(surface, background, (tolerance, tolerance, tolerance, 255))
+    mask.invert()
+    return mask.connected_component()
+
+
+class LazyAssets(dict):
+    """Asset dict whose values may still be loading on a worker thread.
+
+    A value can be a Future; looking it up waits for that one asset only
+    and caches the result. Assets that fail to load are dropped with a
+    warning, so ``in`` and ``get`` degrade per asset instead of losing the
+    whole group.
+    """
+    _missing = object()
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if isinstance(value, Future):
+            try:
+                value = value.result()
+            except (pygame.error, OSError) as e:
+                print(f"Warning: Could not load {key}. {e}")
+                del self[key]
+                raise KeyError(key) from e
+            self[key] = value
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return self.get(key, self._missing) is not self._missing
+
+
+class Audio:
+    """Plays sounds on a bounded set of mixer channels.
+
+    Channel 0 is reserved for the engine loop, so effects can never cut it
+    off. Each sound has a voice limit from SOUND_VOICES: at the limit,
+    playing it again restarts its oldest voice rather than taking another
+    channel. When every channel is busy a sound takes over the oldest voice
+    of the lowest priority no higher than its own, or isn't played. A play
+    only looks at the fixed set of channels, so a burst of kills costs no
+    more than a single shot. Without sound every method does nothing.
+    """
+
+    def __init__(self, sounds, music_loaded=False):
+        self.sounds = sounds
+        self.music_loaded = music_loaded
+        self.enabled = sounds is not None
+        self.voices = {}
+        self.sequence = itertools.count()
+        if self.enabled:
+            pygame.mixer.set_num_channels(MIXER_CHANNELS)
+            pygame.mixer.set_reserved(1)
+            self.engine = pygame.mixer.Channel(ENGINE_CHANNEL)
+            self.channels = [pygame.mixer.Channel(i) for i in range(MIXER_CHANNELS) if i != ENGINE_CHANNEL]
+
+    def play(self, name):
+        if not self.enabled:
+            return
+        sound = self.sounds.get(name)
+        if sound is None:
+            return
+        limit, priority = SOUND_VOICES.get(name, (1, 0))
+        own = []
+        free = None
+        victim = None
+        for channel in self.channels:
+            voice = self.voices.get(channel)
+            if voice is None or not channel.get_busy():
+                if free is None:
+                    free = channel
+            elif voice[0] == name:
+                own.append((voice[2], channel))
+            elif voice[1] <= priority and (victim is None or voice[1:] < self.voices[victim][1:]):
+                victim = channel
+
+        if len(own) >= limit:
+            channel = min(own)[1]
+        else:
+            channel = free or victim
+            if channel is None:
+                return
+        channel.play(sound)
+        self.voices[channel] = (name, priority, next(self.sequence))
+
+    def start_engine(self):
+        if self.enabled and 'engine' in self.sounds:
+            self.engine.play(self.sounds['engine'], -1)
+
+    def start_music(self):
+        if self.music_loaded:
+            pygame.mixer.music.play(-1)
+
+    def pause(self):
+        if self.enabled:
+            pygame.mixer.music.pause()
+            self.engine.pause()
+
+    def unpause(self):
+        if self.enabled:
+            pygame.mixer.music.unpause()
+            self.engine.unpause()
+
+    def stop(self, music=True):
+        """Stop the engine, and the music too unless ``music`` is false."""
+        if self.enabled:
+            if music:
+                pygame.mixer.music.stop()
+            self.engine.stop()
+
+
+class DirtyRects:
+    """Tracks the screen areas drawn each frame for partial display updates.
+
+    Every flush pushes this frame's rects together with last frame's, so the
+    spots objects have just moved away from are repainted as well, plus the
+    ``scrolling`` columns that change on every frame.
+    """
+    MAX_RECTS = 200
+
+    def __init__(self, screen_rect):
+        self.screen_rect = screen_rect
+        self.scrolling = []
+        self.previous = []
+        self.current = []
+        self.full_update = True
+
+    def reset(self, scrolling):
+        self.scrolling = scrolling
+        self.previous = []
+        self.current = []
+        self.full_update = True
+
+    def add(self, rects):
+        clip = self.screen_rect.clip
+        for rect in rects:
+            if rect:
+                rect = clip(rect)
+                if rect:
+                    self.current.append(rect)
+
+    def flush(self):
+        if self.full_update or len(self.previous) + len(self.current) > self.MAX_RECTS:
+            pygame.display.update()
+            self.full_update = False
+        else:
+            pygame.display.update(self.scrolling + self.previous + self.current)
+        self.previous = self.current
+        self.current = []
+
+
+class RenderLayers:
+    """Collects a frame's drawing by layer and submits it in layer order.
+
+    Sprites are (surface, position) pairs and each layer's sprites go to
+    the screen in a single ``Surface.blits`` call. Drawing that isn't a
+    plain sprite (the player's flames and shields, the HUD) is queued as a
+    callable returning the rect or rects it drew, and runs after its
+    layer's sprites.
+    """
+    LAYERS = ('background', 'powerups', 'obstacles', 'player', 'bullets', 'effects', 'hud')
+
     def __init__(self):
-        pygame.init()
+        self.sprites = {layer: [] for layer in self.LAYERS}
+        self.draws = {layer: [] for layer in self.LAYERS}
+
+    def add(self, layer, sprites):
+        self.sprites[layer].extend(sprites)
+
+    def add_draw(self, layer, draw):
+        self.draws[layer].append(draw)
+
+    def submit(self, surface, profiler):
+        """Draw and clear every layer; returns the rects drawn."""
+        drawn = []
+        for layer in self.LAYERS:
+            with profiler.span('draw.' + layer):
+                sprites = self.sprites[layer]
+                if sprites:
+                    drawn.extend(surface.blits(sprites))
+                    sprites.clear()
+                for draw in self.draws[layer]:
+                    rects = draw()
+                    if isinstance(rects, list):
+                        drawn.extend(rects)
+                    elif rects:
+                        drawn.append(rects)
+                self.draws[layer].clear()
+        return drawn
+
+
+class NullSpan:
+    """Shared do-nothing span handed out while profiling is off."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+class Span:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, self.start, time.perf_counter_ns() - self.start)
+        return False
+
+
+class FrameProfiler:
+    """Times named spans of every frame.
+
+    ``span(name)`` is used as a context manager around a piece of the frame;
+    while profiling is off it returns a shared no-op span, so instrumented
+    code only pays for the call. When on, spans are kept for the F3 overlay
+    (a rolling frame-time graph with percentiles and the last frame's
+    breakdown) and for export as Chrome trace-event JSON, which
+    chrome://tracing and Perfetto can open.
+    """
+    HISTORY = 240
+    MAX_EVENTS = 200000
+    GRAPH_MS = 50
+
+    def __init__(self, trace_path=None):
+        self.trace_path = trace_path
+        self.exporter = None
+        self.overlay = False
+        self.enabled = trace_path is not None
+        self.events = deque(maxlen=self.MAX_EVENTS)
+        self.frame_times = deque(maxlen=self.HISTORY)
+        self.frame_spans = {}
+        self.last_spans = {}
+        self.frame_start = None
+        self.origin = time.perf_counter_ns()
+        self.panel = None
+
+    def span(self, name):
+        return Span(self, name) if self.enabled else NULL_SPAN
+
+    def add(self, name, start, duration):
+        self.events.append((name, start, duration))
+        self.frame_spans[name] = self.frame_spans.get(name, 0) + duration
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        if self.frame_start is not None:
+            self.frame_times.append((now - self.frame_start) / 1e6)
+            self.events.append(('frame', self.frame_start, now - self.frame_start))
+        self.frame_start = now
+        self.last_spans = self.frame_spans
+        self.frame_spans = {}
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        self.enabled = self.overlay or self.trace_path is not None
+        # The gap while it was off isn't a frame.
+        self.frame_start = None
+
+    def percentiles(self):
+        times = sorted(self.frame_times)
+        if not times:
+            return {}
+        pick = lambda p: times[min(len(times) - 1, int(len(times) * p))]
+        return {'p50': pick(0.50), 'p95': pick(0.95), 'p99': pick(0.99), 'max': times[-1]}
+
+    def draw(self, surface, fonts, notes=()):
+        """Draw the overlay in the bottom-left corner and return its rect.
+
+        ``notes`` are extra lines shown under the frame-time percentiles.
+        """
+        width, height = 250, 170
+        if self.panel is None:
+            self.panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.panel.fill((0, 0, 0, 170))
+
+        # Frame-time graph, with a line at the 60 fps budget.
+        graph_top, graph_height = 4, 50
+        scale = graph_height / self.GRAPH_MS
+        budget_y = graph_top + graph_height - 1000 / 60 * scale
+        pygame.draw.line(self.panel, YELLOW, (0, budget_y), (width, budget_y))
+        for i, ms in enumerate(self.frame_times):
+            bar = min(graph_height, ms * scale)
+            x = width - len(self.frame_times) + i
+            pygame.draw.line(self.panel, GREEN if ms <= 1000 / 60 else RED,
+                             (x, graph_top + graph_height), (x, graph_top + graph_height - bar))
+
+        font = fonts.get(None, 18)
+        stats = self.percentiles()
+        lines = [" ".join(f"{name} {ms:.1f}" for name, ms in stats.items()) + " ms"] if stats else []
+        lines += notes
+        spans = sorted(self.last_spans.items(), key=lambda item: item[1], reverse=True)
+        lines += [f"{name}: {ns / 1e6:.2f} ms" for name, ns in spans[:7 - len(lines)]]
+        y = graph_top + graph_height + 4
+        for line in lines:
+            self.panel.blit(fonts.render(line, font, WHITE), (4, y))
+            y += 14
+        return surface.blit(self.panel, (0, surface.get_height() - height))
+
+    def export(self, path=None, spans=None):
+        """Write the recorded spans, or ``spans``, as Chrome trace-event JSON."""
+        self.wait_for_export()
+        path = path or self.trace_path
+        events = [{'name': name, 'ph': 'X', 'pid': 1, 'tid': 1,
+                   'ts': (start - self.origin) / 1000, 'dur': duration / 1000}
+                  for name, start, duration in (self.events if spans is None else spans)]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    def export_in_background(self):
+        """Write the spans recorded so far on a worker thread, so the game doesn't stall."""
+        self.wait_for_export()
+        self.exporter = threading.Thread(target=self.export, args=(None, list(self.events)), name='trace-export')
+        self.exporter.start()
+
+    def wait_for_export(self):
+        exporter = self.exporter
+        if exporter is not None and exporter is not threading.current_thread():
+            exporter.join()
+            self.exporter = None
+
+
+class QualityGovernor:
+    """Sheds visual effects while frames run over budget, and restores them.
+
+    ``frame`` is given each frame's working time, without the frame cap's
+    sleep. ``level`` indexes QUALITY_LEVELS, from 0 (minimal) to 4 (full);
+    effects go in this order as it drops: the HUD and speedometer are
+    redrawn every HUD_REFRESH_FRAMES frames, explosions are drawn opaque,
+    the jet flames are left out, and the shield arcs become lines. A
+    governor that isn't ``adaptive`` stays at full quality.
+    """
+
+    def __init__(self, budget_ms, adaptive=True):
+        self.budget_ms = budget_ms
+        self.adaptive = adaptive
+        self.level = len(QUALITY_LEVELS) - 1
+        self.frame_times = deque(maxlen=QUALITY_RESTORE_FRAMES)
+
+    @property
+    def name(self):
+        return QUALITY_LEVELS[self.level]
+
+    @property
+    def hud_interval(self):
+        return 1 if self.level >= 4 else HUD_REFRESH_FRAMES
+
+    @property
+    def explosion_alpha(self):
+        return self.level >= 3
+
+    @property
+    def flames(self):
+        return self.level >= 2
+
+    @property
+    def shield_arcs(self):
+        return self.level >= 1
+
+    def frame(self, ms):
+        if not self.adaptive:
+            return
+        times = self.frame_times
+        times.append(ms)
+        if len(times) >= QUALITY_WINDOW and self.level > 0:
+            recent = sum(itertools.islice(reversed(times), QUALITY_WINDOW)) / QUALITY_WINDOW
+            if recent > self.budget_ms:
+                self.set_level(self.level - 1)
+                return
+        if len(times) == times.maxlen and self.level < len(QUALITY_LEVELS) - 1:
+            if sum(times) / len(times) < self.budget_ms * QUALITY_HEADROOM:
+                self.set_level(self.level + 1)
+
+    def set_level(self, level):
+        self.level = level
+        # Judge the new level on its own frames only.
+        self.frame_times.clear()
+
+    def reset(self):
+        """Forget frame times, e.g. after a pause, keeping the current level."""
+        self.frame_times.clear()
+
+
+class EntityPool:
+    """Free list of reusable entity objects.
+
+    ``capacity`` objects are allocated up front; ``acquire`` re-initialises a
+    free one through ``cls.reset`` and only allocates once the list is
+    empty, and ``release`` keeps at most ``capacity`` objects for reuse.
+    """
+
+    def __init__(self, cls, capacity):
+        self.cls = cls
+        self.capacity = capacity
+        self.free = [cls.__new__(cls) for _ in range(capacity)]
+
+    def acquire(self, *args, **kwargs):
+        entity = self.free.pop() if self.free else self.cls.__new__(self.cls)
+        entity.reset(*args, **kwargs)
+        return entity
+
+    def release(self, entity):
+        if len(self.free) < self.capacity:
+            self.free.append(entity)
+
+
+class TimerQueue:
+    """Callbacks due at points on the game clock, kept in a min-heap.
+
+    ``schedule`` returns a handle for ``cancel``; cancelled timers stay in
+    the heap and are skipped when they come up. ``run`` is called once a
+    tick with the game time and only pops what is due, so a tick with
+    nothing due costs a single comparison. The game clock only moves while
+    playing, so pausing freezes every timer.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.now = 0.0
+        self.sequence = itertools.count()
+
+    def schedule(self, delay, callback, *args):
+        # The sequence number keeps timers due at the same time in order.
+        timer = [self.now + delay, next(self.sequence), callback, args]
+        heapq.heappush(self.heap, timer)
+        return timer
+
+    def cancel(self, timer):
+        if timer:
+            timer[2] = None
+
+    def run(self, now):
+        self.now = now
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            _, _, callback, args = heapq.heappop(heap)
+            if callback:
+                callback(*args)
+
+
+class Leaderboard:
+    """Every finished run in an SQLite database, and the best few in memory.
+
+    The database is in WAL mode, so other games reading it never block a
+    write. Runs are handed to a background thread that commits whatever
+    has queued up in a single transaction, so recording a run never waits
+    on the disk and a transaction either lands whole or not at all. The
+    top ``size`` runs are read once at startup and kept up to date in
+    memory from then on. With no ``path`` nothing touches the disk.
+    """
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY, score INTEGER NOT NULL, '
+        'passed INTEGER NOT NULL, level INTEGER NOT NULL, duration REAL NOT NULL, seed INTEGER, '
+        'finished REAL NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC)',
+    )
+
+    def __init__(self, path=LEADERBOARD_FILE, size=LEADERBOARD_SIZE):
+        self.path = path
+        self.size = size
+        self.top = []
+        self.queue = queue.Queue()
+        self.writer = None
+        if path is None:
+            return
+        try:
+            connection = self.connect()
+            try:
+                self.top = connection.execute(
+                    'SELECT score, passed, level, duration, seed, finished FROM runs '
+                    'ORDER BY score DESC LIMIT ?', (size,)).fetchall()
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            print(f"Warning: Could not open the leaderboard. {e}")
+            return
+        self.writer = threading.Thread(target=self.write_loop, name='leaderboard', daemon=True)
+        self.writer.start()
+        if not self.top:
+            self.import_highscore()
+
+    def connect(self):
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.execute('PRAGMA journal_mode=WAL')
+        for statement in self.SCHEMA:
+            connection.execute(statement)
+        return connection
+
+    def import_highscore(self):
+        """Carry over the score from the old single-number high score file."""
         try:
-            pygame.mixer.init()
-            self.sound_enabled = True
-            self.engine_channel = pygame.mixer.Channel(0)
-        except pygame.error:
+            with open(HIGHSCORE_FILE, "r") as f:
+                score = int(f.read())
+        except (FileNotFoundError, ValueError):
+            return
+        self.record(score, 0, 0, 0.0)
+
+    @property
+    def best(self):
+        return self.top[0][0] if self.top else 0
+
+    def record(self, score, passed, level, duration, seed=None):
+        run = (score, passed, level, duration, seed, time.time())
+        self.top.append(run)
+        self.top.sort(key=lambda run: run[0], reverse=True)
+        del self.top[self.size:]
+        if self.writer:
+            self.queue.put(run)
+
+    def write_loop(self):
+        connection = self.connect()
+        running = True
+        while running:
+            runs = [self.queue.get()]
+            while True:
+                try:
+                    runs.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            # None asks the writer to finish once everything before it is written.
+            running = None not in runs
+            runs = [run for run in runs if run is not None]
+            if runs:
+                try:
+                    with connection:
+                        connection.executemany(
+                            'INSERT INTO runs (score, passed, level, duration, seed, finished) '
+                            'VALUES (?, ?, ?, ?, ?, ?)', runs)
+                except sqlite3.Error as e:
+                    print(f"Warning: Could not save {len(runs)} runs to the leaderboard. {e}")
+        connection.close()
+
+    def close(self):
+        """Write out any queued runs and stop the writer."""
+        if self.writer:
+            self.queue.put(None)
+            self.writer.join()
+            self.writer = None
+
+
+class InputRecording:
+    """Compact per-tick record of the player's key presses, for replays.
+
+    Stores the game's seed, tick rate, entity mode and whether it is a
+    swarm game in a fixed header,
+    followed by one entry per tick that had input: a varint count of ticks
+    since the previous entry, an event count byte, and one byte per event
+    (the index into RECORDED_KEYS, with the high bit set for key-up).
+    Replaying the entries into a headless game with the same seed
+    reproduces the recorded run tick for tick.
+    """
+    MAGIC = b'RRIN'
+    HEADER = struct.Struct('<4sQHBI')
+
+    def __init__(self, seed, tick_rate, entity_arrays=False, swarm=False):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.entity_arrays = entity_arrays
+        self.swarm = swarm
+        self.ticks = 0
+        self.last_input_tick = 0
+        self.data = bytearray()
+
+    def record(self, events):
+        """Append one tick, keeping only the events the player reacts to."""
+        codes = []
+        for event in events:
+            if event.type in (pygame.KEYDOWN, pygame.KEYUP) and event.key in RECORDED_KEYS:
+                code = RECORDED_KEYS.index(event.key)
+                codes.append(code | 0x80 if event.type == pygame.KEYUP else code)
+        # A tick with more than 255 events spills into extra entries 0 ticks apart.
+        for start in range(0, len(codes), 255):
+            self.write_varint(self.ticks - self.last_input_tick)
+            self.last_input_tick = self.ticks
+            chunk = codes[start:start + 255]
+            self.data.append(len(chunk))
+            self.data.extend(chunk)
+        self.ticks += 1
+
+    def write_varint(self, value):
+        while value >= 0x80:
+            self.data.append(value & 0x7F | 0x80)
+            value >>= 7
+        self.data.append(value)
+
+    def inputs(self):
+        """Yield the list of events for every recorded tick."""
+        by_tick = {}
+        data = self.data
+        pos = tick = 0
+        while pos < len(data):
+            delta = shift = 0
+            while True:
+                byte = data[pos]
+                pos += 1
+                delta |= (byte & 0x7F) << shift
+                shift += 7
+                if byte < 0x80:
+                    break
+            tick += delta
+            count = data[pos]
+            events = by_tick.setdefault(tick, [])
+            for code in data[pos + 1:pos + 1 + count]:
+                event_type = pygame.KEYUP if code & 0x80 else pygame.KEYDOWN
+                events.append(pygame.event.Event(event_type, key=RECORDED_KEYS[code & 0x7F]))
+            pos += 1 + count
+        for tick in range(self.ticks):
+            yield by_tick.get(tick, [])
+
+    def save(self, path):
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.seed, self.tick_rate, self.flags(), self.ticks))
+            f.write(self.data)
+        os.replace(temp_path, path)
+
+    def flags(self):
+        return int(self.entity_arrays) | int(self.swarm) << 1
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            magic, seed, tick_rate, flags, ticks = cls.HEADER.unpack(f.read(cls.HEADER.size))
+            if magic != cls.MAGIC:
+                raise ValueError(f"{path} is not an input recording")
+            recording = cls(seed, tick_rate, bool(flags & 1), bool(flags & 2))
+            recording.ticks = ticks
+            recording.data = bytearray(f.read())
+        return recording
+
+
+class Game:
+    def __init__(self, headless=False, entity_arrays=False, dirty_rects=False, tick_rate=TICK_RATE, max_fps=MAX_FPS,
+                 transition_seconds=None, seed=None, record_path=None, profile_path=None, swarm=False,
+                 adaptive_quality=True):
+        # Headless games run on SDL's dummy drivers: no window, no mixer, and
+        # the frame is drawn into an off-screen surface.
+        self.headless = headless
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+        pygame.init()
+        if headless:
             self.sound_enabled = False
-            self.engine_channel = None
-            print("Warning: Could not initialize sound mixer.")
+        else:
+            try:
+                pygame.mixer.init()
+                self.sound_enabled = True
+            except pygame.error:
+                self.sound_enabled = False
+                print("Warning: Could not initialize sound mixer.")
+
+        # Array-backed entity groups are optional and need NumPy.
+        if entity_arrays and np is None:
+            print("Warning: NumPy is not installed; entity arrays disabled.")
+        self.entity_arrays = entity_arrays and np is not None
+        self.set_swarm(swarm)
 
         self.display_width = DISPLAY_WIDTH
         self.display_height = DISPLAY_HEIGHT
-        self.gamedisplays = pygame.display.set_mode((self.display_width, self.display_height))
+        scaled = False
+        if headless:
+            # A display mode is still needed so surfaces have a pixel format.
+            pygame.display.set_mode((1, 1))
+            self.gamedisplays = pygame.Surface((self.display_width, self.display_height))
+        else:
+            # The game always draws an 800x800 frame, and SDL stretches it to
+            # whatever size the window is, so window size doesn't add fill cost
+            # and mouse positions come back in frame coordinates. The frame
+            # itself can't be made smaller: the layout and the gameplay are in
+            # 800x800 pixels throughout.
+            size = (self.display_width, self.display_height)
+            try:
+                self.gamedisplays = pygame.display.set_mode(size, pygame.SCALED | pygame.RESIZABLE)
+                scaled = True
+            except pygame.error:
+                print("Warning: Could not create a scaled window; the window stays at 800x800.")
+                self.gamedisplays = pygame.display.set_mode(size)
         pygame.display.set_caption("Road Rage")
+        # Dirty-rectangle mode only pushes what changed to the window. A
+        # scaled window presents the whole frame on every update anyway.
+        if dirty_rects and scaled:
+            print("Warning: Dirty rects save nothing in a scaled window; dirty rects disabled.")
+            dirty_rects = False
+        self.dirty_rects = DirtyRects(self.gamedisplays.get_rect()) if dirty_rects and not headless else None
+        self.fonts = FontCache()
+        self.rect_masks = {}
+        self.profiler = FrameProfiler(profile_path)
+        self.layers = RenderLayers()
+        # Array mode builds entities from their store-backed subclasses, so
+        # list mode keeps plain attributes.
+        stored = lambda cls: cls.stored() if self.entity_arrays else cls
+        self.obstacle_class = stored(Obstacle)
+        self.pools = {cls: EntityPool(stored(cls), POOL_CAPACITY[cls.__name__]) for cls in (Bullet, EnemyBullet, PowerUp)}
+        self.pools[Explosion] = EntityPool(Explosion, POOL_CAPACITY['Explosion'])
+        # Released entities find their pool by their own class.
+        self.pools.update({pool.cls: pool for pool in list(self.pools.values())})
+        self.road_tile_key = None
+        self.obstacle_grid = CollisionGrid()
         self.clock = pygame.time.Clock()
+        # Gameplay runs in fixed ticks; max_fps only caps rendering (0 = uncapped).
+        self.tick_rate = tick_rate
+        self.tick_seconds = 1 / tick_rate
+        # Speeds are in pixels per tick at TICK_RATE; every move is scaled by
+        # this so the game runs at the same pace at any tick rate.
+        self.tick_scale = TICK_RATE / tick_rate
+        self.max_fps = max_fps
+        # Effects are shed to hold the frame rate; never in headless games,
+        # which aren't timed.
+        self.governor = QualityGovernor(1000 / (max_fps or MAX_FPS), adaptive_quality and not headless)
+        self.hud_frame = 0
+        self.hud_text = pygame.Surface(HUD_TEXT_SIZE, pygame.SRCALPHA)
+        self.speedometer = pygame.Surface((SPEEDOMETER_SIZE, SPEEDOMETER_SIZE), pygame.SRCALPHA)
+        self.render_alpha = 1.0
+        # Headless runs skip the countdown, level-up and crash screens by default.
+        if transition_seconds is None:
+            transition_seconds = dict.fromkeys(TRANSITION_SECONDS, 0) if headless else TRANSITION_SECONDS
+        self.transition_seconds = dict(transition_seconds)
+        self.state_time = 0.0
         self.game_state = 'INTRO'
+
+        # Every game gets its own seed from this sequence unless one is given,
+        # and gameplay randomness only ever comes from self.rng.
+        self.seeds = random.Random(seed)
+        self.record_path = record_path
+        self.recording = None
         self.pause = False
 
         # Load assets
+        self.asset_pipeline = AssetPipeline()
+        self.surfaces = SurfaceRegistry(self.asset_pipeline)
         self.assets = self.load_assets()
-        self.highscore = 0
-        self.load_highscore()
-
-        self.new_game()
-
-    def load_highscore(self):
-        try:
-            with open(HIGHSCORE_FILE, "r") as f:
-                self.highscore = int(f.read())
-        except (FileNotFoundError, ValueError):
-            self.highscore = 0
-
-    def save_highscore(self):
-        with open(HIGHSCORE_FILE, "w") as f:
-            f.write(str(self.highscore))
-
-    def new_game(self):
+        # Headless games keep their leaderboard in memory only.
+        self.leaderboard = Leaderboard(None if headless else LEADERBOARD_FILE)
+        self.highscore = self.leaderboard.best
+
+        # start_game sets up each game, so nothing waits on the car images
+        # until play starts.
+        self.player = None
+        self.obstacles, self.bullets, self.enemy_bullets, self.explosions, self.powerups = [], [], [], [], []
+
+    def new_game(self, seed=None):
+        if seed is None:
+            seed = self.seeds.getrandbits(63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        # Cosmetic randomness has its own generator so drawing can't change the game.
+        self.fx_rng = random.Random(f"{seed}:fx")
+        self.game_time = 0.0
+        self.timers = TimerQueue()
         self.background_y = 0
-        self.lives = 4
+        self.prev_background_y = 0
+        self.lives = STARTING_LIVES
+        self.lives_lost = 0
+        # The HUD is redrawn for the new game straight away.
+        self.hud_values = None
+        self.hud_speed = None
+        self.death_cause = None
         self.level = 1
         self.crash_time = 0
         self.score = 0
         self.passed = 0
-        self.next_life_milestone = 500
+        self.next_life_milestone = self.life_score()
+        # The mask job locks the car images while it reads them, so it must be
+        # done before they are drawn.
+        self.assets.get('car_masks')
         self.player = Player(self)
-        self.obstacles = [Obstacle(self)]
-        self.bullets = []
-        self.enemy_bullets = []
+        self.obstacles = self.new_group([] if self.swarm else [self.obstacle_class(self)])
+        self.bullets = self.new_group()
+        self.enemy_bullets = self.new_group()
         self.explosions = []
-        self.powerups = []
+        self.powerups = self.new_group()
+        self.powerup_timer = None
         self.speed_offset = 0
+        self.deferred_events = []
         self.game_state = 'INTRO'
+        self.swarm_timer = None
+        if self.swarm:
+            self.swarm_timer = self.timers.schedule(0, self.spawn_swarm_row)
+
+    def set_swarm(self, swarm):
+        """Choose swarm mode or the normal game for the games that follow."""
+        self.swarm = swarm
+        self.passes_per_level = SWARM_PASSES_PER_LEVEL if swarm else PASSES_PER_LEVEL
+        self.fire_level = 1 if swarm else 2
+
+    def life_score(self):
+        """Points between extra lives: ten levels' worth of passes."""
+        return self.passes_per_level * 10
+
+    def new_group(self, entities=()):
+        """Return an entity group: an EntityStore in array mode, else a list."""
+        if not self.entity_arrays:
+            return list(entities)
+        group = EntityStore()
+        for entity in entities:
+            group.append(entity)
+        return group
+
+    def spawn(self, cls, *args, **kwargs):
+        """Take an entity of a pooled type from its pool."""
+        return self.pools[cls].acquire(self, *args, **kwargs)
+
+    def release(self, entity):
+        pool = self.pools.get(type(entity))
+        if pool:
+            pool.release(entity)
+
+    def remove_entities(self, group, entities):
+        """Remove several entities from a group in a single pass."""
+        if not entities:
+            return
+        if isinstance(group, EntityStore):
+            keep = np.ones(len(group), dtype=bool)
+            keep[[entity._index for entity in entities]] = False
+            for entity in group.compact(keep):
+                self.release(entity)
+        else:
+            doomed = set(entities)
+            self.compact_group(group, lambda entity: entity not in doomed)
+
+    def compact_group(self, group, keep):
+        """Drop list entries for which ``keep`` is false, in place.
+
+        Dropped entities go back to their pools.
+        """
+        write = 0
+        for entity in group:
+            if keep(entity):
+                group[write] = entity
+                write += 1
+            else:
+                self.release(entity)
+        del group[write:]
 
     def load_assets(self):
-        assets = {
-            'carimg': pygame.image.load('car1.jpg'),
-            'backgroundpic': pygame.image.load("download12.jpg"),
-            'yellow_strip': pygame.image.load("yellow strip.jpg"),
-            'strip': pygame.image.load("strip.jpg"),
-            'intro_background': pygame.image.load("background.jpg"),
-            'instruction_background': pygame.image.load("background2.jpg"),
-            'obstacle_cars': [
-                pygame.image.load("car.jpg"),
-                pygame.image.load("car1.jpg"),
-                pygame.image.load("car2.jpg"),
-                pygame.image.load("car4.jpg"),
-                pygame.image.load("car5.jpg"),
-                pygame.image.load("car6.jpg"),
-                pygame.image.load("car7.jpg")
-            ],
-            'sounds': {}
-        }
-        try:
-            boom_image = pygame.image.load('boom.jpg')
-            # Get the size of a sample enemy car
-            car_width = assets['obstacle_cars'][0].get_width()
-            car_height = assets['obstacle_cars'][0].get_height()
-            assets['boom'] = pygame.transform.scale(boom_image, (int(car_width * 1.5), int(car_height * 1.5)))
-            assets['boom'].set_alpha(128)
-        except (pygame.error, FileNotFoundError):
-            assets['boom'] = None
-
+        # Everything is decoded on a worker pool and resolved on first use.
+        # The pool takes jobs in order, so the screen backgrounds are queued
+        # first and the intro can be drawn while the cars, the masks and the
+        # sounds are still loading.
+        pipeline = self.asset_pipeline
+        load = self.surfaces.load
+        self.asset_loader = ThreadPoolExecutor(ASSET_LOADER_THREADS, thread_name_prefix='assets')
+        submit = self.asset_loader.submit
+        intro_background = submit(load, "background.jpg")
+        instruction_background = submit(load, "background2.jpg")
+        obstacle_cars = submit(lambda: [load(path) for path in OBSTACLE_CAR_FILES])
+        carimg = submit(load, 'car1.jpg')
+        assets = LazyAssets({
+            'intro_background': intro_background,
+            'instruction_background': instruction_background,
+            'carimg': carimg,
+            'obstacle_cars': obstacle_cars,
+            'car_masks': submit(self.load_car_masks, carimg, obstacle_cars),
+            'backgroundpic': submit(load, "download12.jpg"),
+            'yellow_strip': submit(load, "yellow strip.jpg"),
+            'strip': submit(load, "strip.jpg"),
+            'boom': submit(self.load_boom, obstacle_cars),
+        })
+
+        self.music_loaded = False
         if self.sound_enabled:
+            assets['sounds'] = LazyAssets({name: submit(pipeline.load_sound, path) for name, path in SOUND_FILES.items()})
             try:
-                assets['sounds']['engine'] = pygame.mixer.Sound('engine.mp3')
-                assets['sounds']['crash'] = pygame.mixer.Sound('crash.mp3')
-                assets['sounds']['horn'] = pygame.mixer.Sound('horn.mp3')
-                assets['sounds']['breaks'] = pygame.mixer.Sound('breaks.mp3')
-                assets['sounds']['beep'] = pygame.mixer.Sound('beep.mp3')
-                assets['sounds']['go'] = pygame.mixer.Sound('go.mp3')
-                assets['sounds']['engine2'] = pygame.mixer.Sound('engine2.mp3')
-                assets['sounds']['gun'] = pygame.mixer.Sound('gun.mp3')
-                assets['sounds']['explosion'] = pygame.mixer.Sound('explosion.mp3')
-                assets['sounds']['powerup'] = pygame.mixer.Sound('power up.mp3')
-                pygame.mixer.music.load('Car Chase.mp3')
-            except pygame.error as e:
-                print(f"Warning: Could not load sound files. {e}")
-                assets['sounds'] = None
+                pygame.mixer.music.load(MUSIC_FILE)
+                self.music_loaded = True
+            except (pygame.error, OSError) as e:
+                print(f"Warning: Could not load music. {e}")
         else:
             assets['sounds'] = None
 
+        self.audio = Audio(assets['sounds'], self.music_loaded)
         return assets
 
+    def load_car_masks(self, carimg, obstacle_cars):
+        """Masks for every car image, keyed by the image surface itself."""
+        cars = [carimg.result()] + obstacle_cars.result()
+        return {car: car_mask(car) for car in cars}
+
+    def load_boom(self, obstacle_cars):
+        try:
+            # Get the size of a sample enemy car
+            car = obstacle_cars.result()[0]
+            size = (int(car.get_width() * 1.5), int(car.get_height() * 1.5))
+            boom = self.surfaces.load('boom.jpg', size)
+            boom.set_alpha(128)
+            return boom
+        except (pygame.error, FileNotFoundError):
+            return None
+
     def run(self):
         while True:
             if self.game_state == 'INTRO':
@@ -140,19 +1524,58 @@ class Game:
                 self.paused_loop()
             elif self.game_state == 'LEVEL_UP':
                 self.level_up_loop()
+            elif self.game_state == 'CRASHED':
+                self.crashed_loop()
             elif self.game_state == 'GAME_OVER':
                 self.game_over_loop()
 
+    def enter_timed_state(self, state):
+        """Switch to a screen that ends by itself after transition_seconds[state].
+
+        The screen is only ever ended between ticks, by the next ``update``
+        or the timed loop, even when it lasts no time at all, so the tick
+        that entered it finishes the same way in every mode.
+        """
+        self.game_state = state
+        self.state_time = 0.0
+
+    def advance_timed_state(self, seconds):
+        self.state_time += seconds
+        if self.state_time >= self.transition_seconds[self.game_state]:
+            if self.game_state == 'COUNTDOWN':
+                self.game_state = 'PLAYING'
+            elif self.game_state == 'LEVEL_UP':
+                self.finish_level_up()
+            elif self.game_state == 'CRASHED':
+                self.respawn()
+
+    def timed_loop(self, draw):
+        """Show the current timed state until it ends, keeping events pumped."""
+        state = self.game_state
+        self.clock.tick()
+        while self.game_state == state:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.quit_game()
+                # Keys let go of meanwhile reach the player when play resumes,
+                # so the car doesn't keep drifting.
+                if event.type == pygame.KEYUP:
+                    self.deferred_events.append(event)
+            draw()
+            pygame.display.update()
+            self.advance_timed_state(self.clock.tick(30) / 1000)
+
     def level_up_loop(self):
+        self.timed_loop(self.draw_level_up)
+
+    def draw_level_up(self):
         self.gamedisplays.blit(self.assets['instruction_background'], (0, 0))
-        large_text = pygame.font.Font('freesansbold.ttf', 115)
+        large_text = self.fonts.get('freesansbold.ttf', 115)
         text_surf, text_rect = self.text_objects("LEVEL " + str(self.level), large_text)
         text_rect.center = (self.display_width / 2, self.display_height / 2)
         self.gamedisplays.blit(text_surf, text_rect)
 
-        pygame.display.update()
-        time.sleep(2)
-
+    def finish_level_up(self):
         self.player.shield_hits = 8
         self.game_state = 'PLAYING'
 
@@ -161,39 +1584,32 @@ class Game:
             self.game_state = 'PAUSED'
         elif self.game_state == 'PAUSED':
             self.game_state = 'PLAYING'
-            if self.assets['sounds']:
-                pygame.mixer.music.unpause()
-                if hasattr(self, 'engine_channel'):
-                    self.engine_channel.unpause()
+            self.audio.unpause()
 
     def paused_loop(self):
-        if self.assets['sounds']:
-            pygame.mixer.music.pause()
-            if hasattr(self, 'engine_channel'):
-                self.engine_channel.pause()
+        self.audio.pause()
 
         while self.game_state == 'PAUSED':
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.quit_game()
 
-            self.gamedisplays.blit(self.assets['instruction_background'], (0, 0))
-            large_text = pygame.font.Font('freesansbold.ttf', 115)
-            text_surf, text_rect = self.text_objects("PAUSED", large_text)
-            text_rect.center = (self.display_width / 2, self.display_height / 2)
-            self.gamedisplays.blit(text_surf, text_rect)
-
-            self.button("CONTINUE", 150, 450, 150, 50, GREEN, BRIGHT_GREEN, self.toggle_pause)
-            self.button("MAIN MENU", 550, 450, 200, 50, RED, BRIGHT_RED, self.back_to_menu)
-
+            self.draw_paused()
             pygame.display.update()
             self.clock.tick(30)
 
+    def draw_paused(self):
+        self.gamedisplays.blit(self.assets['instruction_background'], (0, 0))
+        large_text = self.fonts.get('freesansbold.ttf', 115)
+        text_surf, text_rect = self.text_objects("PAUSED", large_text)
+        text_rect.center = (self.display_width / 2, self.display_height / 2)
+        self.gamedisplays.blit(text_surf, text_rect)
+
+        self.button("CONTINUE", 150, 450, 150, 50, GREEN, BRIGHT_GREEN, self.toggle_pause)
+        self.button("MAIN MENU", 550, 450, 200, 50, RED, BRIGHT_RED, self.back_to_menu)
+
     def intro_loop(self):
-        if self.assets['sounds']:
-            pygame.mixer.music.stop()
-            if hasattr(self, 'engine_channel'):
-                self.engine_channel.stop()
+        self.audio.stop()
 
         while self.game_state == 'INTRO':
             for event in pygame.event.get():
@@ -203,21 +1619,25 @@ class Game:
                     if event.key == pygame.K_RETURN:
                         self.start_game()
 
-            self.gamedisplays.blit(self.assets['intro_background'], (0, 0))
-            large_text = pygame.font.Font('freesansbold.ttf', 115)
-            text_surf, text_rect = self.text_objects("ROAD RAGE", large_text)
-            text_rect.center = (400, 100)
-            self.gamedisplays.blit(text_surf, text_rect)
+            self.draw_intro()
+            pygame.display.update()
+            self.clock.tick(50)
 
-            font = pygame.font.SysFont(None, 40)
-            highscore_text = font.render("High Score: " + str(self.highscore), True, BLACK)
-            self.gamedisplays.blit(highscore_text, (self.display_width / 2 - highscore_text.get_width() / 2, 200))
+    def draw_intro(self):
+        self.gamedisplays.blit(self.assets['intro_background'], (0, 0))
+        large_text = self.fonts.get('freesansbold.ttf', 115)
+        text_surf, text_rect = self.text_objects("ROAD RAGE", large_text)
+        text_rect.center = (400, 100)
+        self.gamedisplays.blit(text_surf, text_rect)
 
-            self.button("START", 250, 520, 100, 50, GREEN, BRIGHT_GREEN, self.start_game)
-            self.button("QUIT", 450, 520, 100, 50, RED, BRIGHT_RED, self.quit_game)
+        font = self.fonts.get(None, 40)
+        highscore_text = self.fonts.render("High Score: " + str(self.highscore), font, BLACK)
+        self.gamedisplays.blit(highscore_text, (self.display_width / 2 - highscore_text.get_width() / 2, 200))
+        self.draw_leaderboard(250)
 
-            pygame.display.update()
-            self.clock.tick(50)
+        self.button("START", 180, 520, 100, 50, GREEN, BRIGHT_GREEN, lambda: self.start_game(swarm=False))
+        self.button("SWARM", 350, 520, 100, 50, BLUE, BRIGHT_BLUE, lambda: self.start_game(swarm=True))
+        self.button("QUIT", 520, 520, 100, 50, RED, BRIGHT_RED, self.quit_game)
 
     def introduction(self):
         while self.game_state == 'INSTRUCTIONS':
@@ -225,49 +1645,53 @@ class Game:
                 if event.type == pygame.QUIT:
                     self.quit_game()
 
-            self.gamedisplays.blit(self.assets['instruction_background'], (0, 0))
-            large_text = pygame.font.Font('freesansbold.ttf', 80)
-            small_text = pygame.font.Font('freesansbold.ttf', 20)
-            medium_text = pygame.font.Font('freesansbold.ttf', 40)
+            self.draw_instructions()
+            pygame.display.update()
+            self.clock.tick(30)
 
-            text_surf, text_rect = self.text_objects("This is a car game in which you need to dodge the coming cars", small_text)
-            text_rect.center = ((350), (200))
-            self.gamedisplays.blit(text_surf, text_rect)
+    def draw_instructions(self):
+        self.gamedisplays.blit(self.assets['instruction_background'], (0, 0))
+        large_text = self.fonts.get('freesansbold.ttf', 80)
+        small_text = self.fonts.get('freesansbold.ttf', 20)
+        medium_text = self.fonts.get('freesansbold.ttf', 40)
 
-            text_surf, text_rect = self.text_objects("INSTRUCTION", large_text)
-            text_rect.center = ((400), (100))
-            self.gamedisplays.blit(text_surf, text_rect)
+        text_surf, text_rect = self.text_objects("This is a car game in which you need to dodge the coming cars", small_text)
+        text_rect.center = ((350), (200))
+        self.gamedisplays.blit(text_surf, text_rect)
 
-            stext_surf, stext_rect = self.text_objects("ARROW LEFT : LEFT TURN", small_text)
-            stext_rect.center = ((150), (400))
-            self.gamedisplays.blit(stext_surf, stext_rect)
+        text_surf, text_rect = self.text_objects("INSTRUCTION", large_text)
+        text_rect.center = ((400), (100))
+        self.gamedisplays.blit(text_surf, text_rect)
 
-            htext_surf, htext_rect = self.text_objects("ARROW RIGHT : RIGHT TURN", small_text)
-            htext_rect.center = ((150), (450))
-            self.gamedisplays.blit(htext_surf, htext_rect)
+        stext_surf, stext_rect = self.text_objects("ARROW LEFT : LEFT TURN", small_text)
+        stext_rect.center = ((150), (400))
+        self.gamedisplays.blit(stext_surf, stext_rect)
 
-            atext_surf, atext_rect = self.text_objects("ARROW UP : ACCELERATOR", small_text)
-            atext_rect.center = ((150), (500))
-            self.gamedisplays.blit(atext_surf, atext_rect)
+        htext_surf, htext_rect = self.text_objects("ARROW RIGHT : RIGHT TURN", small_text)
+        htext_rect.center = ((150), (450))
+        self.gamedisplays.blit(htext_surf, htext_rect)
 
-            rtext_surf, rtext_rect = self.text_objects("ARROW DOWN : BRAKE ", small_text)
-            rtext_rect.center = ((150), (550))
-            self.gamedisplays.blit(rtext_surf, rtext_rect)
+        atext_surf, atext_rect = self.text_objects("ARROW UP : ACCELERATOR", small_text)
+        atext_rect.center = ((150), (500))
+        self.gamedisplays.blit(atext_surf, atext_rect)
 
-            ptext_surf, ptext_rect = self.text_objects("P : PAUSE", small_text)
-            ptext_rect.center = ((150), (350))
-            self.gamedisplays.blit(ptext_surf, ptext_rect)
+        rtext_surf, rtext_rect = self.text_objects("ARROW DOWN : BRAKE ", small_text)
+        rtext_rect.center = ((150), (550))
+        self.gamedisplays.blit(rtext_surf, rtext_rect)
 
-            stext_surf, stext_rect = self.text_objects("CONTROLS", medium_text)
-            stext_rect.center = ((350), (300))
-            self.gamedisplays.blit(stext_surf, stext_rect)
+        ptext_surf, ptext_rect = self.text_objects("P : PAUSE", small_text)
+        ptext_rect.center = ((150), (350))
+        self.gamedisplays.blit(ptext_surf, ptext_rect)
 
-            self.button("BACK", 600, 450, 100, 50, BLUE, BRIGHT_BLUE, self.back_to_menu)
+        stext_surf, stext_rect = self.text_objects("CONTROLS", medium_text)
+        stext_rect.center = ((350), (300))
+        self.gamedisplays.blit(stext_surf, stext_rect)
 
-            pygame.display.update()
-            self.clock.tick(30)
+        self.button("BACK", 600, 450, 100, 50, BLUE, BRIGHT_BLUE, self.back_to_menu)
 
     def get_max_obstacles(self):
+        if self.swarm:
+            return min(SWARM_OBSTACLES_PER_LEVEL * self.level, SWARM_MAX_OBSTACLES)
         if self.level >= 8:
             return 4
         elif self.level >= 3:
@@ -276,84 +1700,124 @@ class Game:
             return 1
 
     def game_loop(self):
-        if self.sound_enabled and self.assets['sounds']:
-            self.engine_channel.play(self.assets['sounds']['engine'], -1)
-
+        self.audio.start_engine()
+
+        if self.dirty_rects:
+            # The previous screen covered everything, so start with a full update.
+            self.dirty_rects.reset(self.scrolling_rects())
+
+        # Fixed-timestep loop: the simulation always advances in whole ticks
+        # of tick_seconds, however long frames take, and each frame is drawn
+        # between the last two ticks.
+        self.clock.tick()
+        self.governor.reset()
+        accumulator = 0.0
+        pending = self.deferred_events
+        self.deferred_events = []
+        profiler = self.profiler
         while self.game_state == 'PLAYING':
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.quit_game()
-                self.player.handle_event(event)
+            with profiler.span('events'):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        self.quit_game()
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                        profiler.toggle_overlay()
+                        continue
+                    pending.append(event)
+
+            while accumulator >= self.tick_seconds and self.game_state == 'PLAYING':
+                with profiler.span('tick'):
+                    self.snapshot()
+                    self.update(pending)
+                pending = []
+                accumulator -= self.tick_seconds
+
+            if self.game_state == 'PLAYING':
+                self.render_alpha = accumulator / self.tick_seconds
+                self.draw_frame()
+                self.render_alpha = 1.0
+                with profiler.span('display.update'):
+                    if self.dirty_rects:
+                        self.dirty_rects.flush()
+                    else:
+                        pygame.display.update()
+
+            with profiler.span('clock.tick'):
+                elapsed = self.clock.tick(self.max_fps)
+            self.governor.frame(self.clock.get_rawtime())
+            accumulator += min(elapsed / 1000, MAX_FRAME_SECONDS)
+            profiler.end_frame()
+
+    def step(self, inputs=(), render=True):
+        """Advance the game by one tick and return the resulting game state.
+
+        ``inputs`` is an iterable of pygame events for the player. Nothing in
+        here waits on the clock or flips the display, so headless callers can
+        run ticks as fast as the CPU allows; pass ``render=False`` to skip
+        drawing as well. Countdown, level-up and crash screens advance by one
+        tick's worth of time per call, and take no time at all in headless
+        games by default.
+        """
+        self.update(inputs)
+        if render and self.game_state == 'PLAYING':
+            self.draw_frame()
+        return self.game_state
+
+    def update(self, inputs=()):
+        """Run one simulation tick of ``tick_seconds`` game time."""
+        if self.game_state in self.transition_seconds:
+            self.advance_timed_state(self.tick_seconds)
+        if self.game_state != 'PLAYING':
+            return
 
-            max_obstacles = self.get_max_obstacles()
-            if len(self.obstacles) < max_obstacles:
-                self.obstacles.append(Obstacle(self))
+        self.game_time += self.tick_seconds
+        self.timers.run(self.game_time)
+        if self.recording:
+            self.recording.record(inputs)
+        for event in inputs:
+            self.player.handle_event(event)
 
+        if not self.swarm and len(self.obstacles) < self.get_max_obstacles():
+            self.obstacles.append(self.obstacle_class(self))
+
+        with self.profiler.span('Player.update'):
             self.player.update()
-            if len(self.powerups) < 1 and random.random() < 0.01:
-                self.powerups.append(PowerUp(self))
-
-            for powerup in self.powerups:
-                powerup.update()
-            for obstacle in self.obstacles:
-                obstacle.update()
-            for bullet in self.bullets:
-                bullet.update()
-            for bullet in self.enemy_bullets:
-                bullet.update()
-            for explosion in self.explosions:
-                explosion.update()
-
-            # Remove bullets that are off-screen
-            self.bullets = [bullet for bullet in self.bullets if bullet.y > 0]
-            self.enemy_bullets = [bullet for bullet in self.enemy_bullets if bullet.y < self.display_height]
-
-            # Handle bullet-obstacle collisions
-            for bullet in self.bullets[:]:
-                for obstacle in self.obstacles[:]:
-                    if bullet.y < obstacle.y + obstacle.height and bullet.y + bullet.height > obstacle.y and \
-                       bullet.x < obstacle.x + obstacle.width and bullet.x + bullet.width > obstacle.x:
-                        if self.assets['sounds'] and 'explosion' in self.assets['sounds']:
-                            self.assets['sounds']['explosion'].play()
-                        self.explosions.append(Explosion(self, obstacle.x, obstacle.y))
-                        self.obstacles.remove(obstacle)
-                        self.bullets.remove(bullet)
-                        self.score += 25
-                        break
-
-            # Handle deflected enemy bullet-obstacle collisions
-            for bullet in self.enemy_bullets[:]:
-                if bullet.deflected:
-                    for obstacle in self.obstacles[:]:
-                        if bullet.y < obstacle.y + obstacle.height and bullet.y + bullet.height > obstacle.y and \
-                           bullet.x < obstacle.x + obstacle.width and bullet.x + bullet.width > obstacle.x:
-                            if self.assets['sounds'] and 'explosion' in self.assets['sounds']:
-                                self.assets['sounds']['explosion'].play()
-                            self.explosions.append(Explosion(self, obstacle.x, obstacle.y))
-                            self.obstacles.remove(obstacle)
-                            self.enemy_bullets.remove(bullet)
-                            self.score += 25  # Award points for deflected shot kill
-                            break
-
-            self.background_y += (9 + self.speed_offset)
-
-            self.draw_background()
-            self.player.draw()
-            for obstacle in self.obstacles:
-                obstacle.draw()
-            for powerup in self.powerups:
-                powerup.draw()
-            for bullet in self.bullets:
-                bullet.draw()
-            for bullet in self.enemy_bullets:
-                bullet.draw()
-            for explosion in self.explosions:
-                explosion.draw()
-
-            # The speed displayed in the HUD will be the speed of the first car in the list,
-            # including the player's speed offset for acceleration/braking.
-            self.display_hud(self.speed_offset)
-            self.button("PAUSE", 650, 0, 150, 50, BLUE, BRIGHT_BLUE, self.toggle_pause)
+
+        with self.profiler.span('entities.update'):
+            if self.entity_arrays:
+                PowerUp.update_batch(self, self.powerups)
+                Obstacle.update_batch(self, self.obstacles)
+                Bullet.update_batch(self, self.bullets)
+                Bullet.update_batch(self, self.enemy_bullets)
+            else:
+                for powerup in self.powerups:
+                    powerup.update()
+                for obstacle in self.obstacles:
+                    obstacle.update()
+                for bullet in self.bullets:
+                    bullet.update()
+                for bullet in self.enemy_bullets:
+                    bullet.update()
+
+            # Remove bullets and power-ups that are off-screen
+            if self.entity_arrays:
+                for bullet in self.bullets.compact(self.bullets.view('y') > 0):
+                    self.release(bullet)
+                x = self.enemy_bullets.view('x')
+                y = self.enemy_bullets.view('y')
+                on_screen = (x > 0) & (x < self.display_width) & (y > 0) & (y < self.display_height)
+                for bullet in self.enemy_bullets.compact(on_screen):
+                    self.release(bullet)
+            else:
+                self.compact_group(self.powerups, PowerUp.on_screen)
+                self.compact_group(self.bullets, Bullet.on_screen)
+                self.compact_group(self.enemy_bullets, EnemyBullet.on_screen)
+
+        self.background_y += (9 + self.speed_offset) * self.tick_scale
+
+        with self.profiler.span('collisions'):
+            self.obstacle_grid.build(self.obstacles)
+            self.resolve_bullet_hits()
 
             if self.check_crash():
                 self.handle_crash()
@@ -361,27 +1825,159 @@ class Game:
             self.check_bullet_collisions()
             self.check_powerup_collision()
 
-            pygame.display.update()
-            self.clock.tick(60)
+        # The next power-up is timed from when the road is clear of them.
+        if self.powerup_timer is None and not self.powerups:
+            self.powerup_timer = self.timers.schedule(self.rng.expovariate(POWERUP_SPAWN_RATE), self.spawn_powerup)
+
+    def spawn_swarm_row(self):
+        """Send a car down every lane but one, if the level has room for a row."""
+        self.swarm_timer = self.timers.schedule(SWARM_ROW_SECONDS, self.spawn_swarm_row)
+        if len(self.obstacles) + SWARM_LANES - 1 > self.get_max_obstacles():
+            return
+        lane_width = (ROAD_RIGHT - ROAD_LEFT) / SWARM_LANES
+        car_width = self.assets['obstacle_cars'][0].get_width()
+        gap = self.rng.randrange(SWARM_LANES)
+        for lane in range(SWARM_LANES):
+            if lane != gap:
+                x = int(ROAD_LEFT + (lane + 0.5) * lane_width - car_width / 2)
+                self.obstacles.append(self.obstacle_class(self, x))
+
+    def spawn_powerup(self):
+        self.powerup_timer = None
+        self.powerups.append(self.spawn(PowerUp))
+
+    def expire_explosion(self, explosion):
+        if explosion in self.explosions:
+            self.explosions.remove(explosion)
+            self.release(explosion)
+
+    def snapshot(self):
+        """Remember where everything was before a tick, for interpolation."""
+        self.prev_background_y = self.background_y
+        self.player.snapshot()
+        for group in (self.obstacles, self.powerups, self.bullets, self.enemy_bullets):
+            if isinstance(group, EntityStore):
+                group.view('px')[:] = group.view('x')
+                group.view('py')[:] = group.view('y')
+            else:
+                for entity in group:
+                    entity.snapshot()
+
+    def draw_frame(self):
+        """Draw the gameplay screen at ``render_alpha`` between the last two ticks."""
+        layers = self.layers
+        layers.add_draw('background', self.draw_background)
+        layers.add('powerups', self.sprites(self.powerups))
+        layers.add('obstacles', self.sprites(self.obstacles))
+        layers.add_draw('player', self.player.draw)
+        layers.add('bullets', self.sprites(self.bullets))
+        layers.add('bullets', self.sprites(self.enemy_bullets))
+        effects = [(explosion.image, (explosion.x, explosion.y)) for explosion in self.explosions if explosion.image]
+        if effects and not self.governor.explosion_alpha:
+            opaque = self.surfaces.derive('boom (opaque)', self.opaque_boom)
+            effects = [(opaque, position) for _, position in effects]
+        layers.add('effects', effects)
+        # The speed displayed in the HUD will be the speed of the first car in the list,
+        # including the player's speed offset for acceleration/braking.
+        layers.add_draw('hud', lambda: self.display_hud(self.speed_offset))
+        layers.add_draw('hud', lambda: self.button("PAUSE", 650, 0, 150, 50, BLUE, BRIGHT_BLUE, self.toggle_pause))
+        if self.profiler.overlay:
+            notes = [f"quality: {self.governor.name}"]
+            layers.add_draw('hud', lambda: self.profiler.draw(self.gamedisplays, self.fonts, notes))
+        drawn = layers.submit(self.gamedisplays, self.profiler)
+        if self.dirty_rects:
+            self.dirty_rects.add(drawn)
+
+    def opaque_boom(self):
+        boom = self.assets['boom'].copy()
+        boom.set_alpha(None)
+        return boom
+
+    def sprites(self, group):
+        """(image, position) pairs for a group's entities at ``render_alpha``."""
+        alpha = self.render_alpha
+        if isinstance(group, EntityStore):
+            if not len(group):
+                return []
+            prev_x = group.view('px')
+            prev_y = group.view('py')
+            xs = (prev_x + (group.view('x') - prev_x) * alpha).tolist()
+            ys = (prev_y + (group.view('y') - prev_y) * alpha).tolist()
+            return list(zip([entity.image for entity in group], zip(xs, ys)))
+        if alpha >= 1.0:
+            return [(entity.image, (entity.x, entity.y)) for entity in group]
+        return [(entity.image, (entity.prev_x + (entity.x - entity.prev_x) * alpha,
+                                entity.prev_y + (entity.y - entity.prev_y) * alpha))
+                for entity in group]
+
+    def resolve_bullet_hits(self):
+        """Destroy obstacles hit by player bullets or deflected enemy bullets."""
+        if not self.obstacles:
+            return
+        destroyed = []
+        grid = self.obstacle_grid
+        hits_car = self.hits_car
+        deflected = [bullet for bullet in self.enemy_bullets if bullet.deflected]
+        for group, bullets in ((self.bullets, self.bullets), (self.enemy_bullets, deflected)):
+            rects = [bullet.get_rect() for bullet in bullets]
+            spent = []
+            # Only bullets already touching an obstacle's rect need the narrow phase.
+            for index in grid.touching(rects):
+                rect = rects[index]
+                hits = [obstacle for obstacle in grid.query(rect)
+                        if hits_car(obstacle.image, obstacle.x, obstacle.y, rect)]
+                if hits:
+                    self.destroy_obstacle(hits[0])
+                    destroyed.append(hits[0])
+                    spent.append(bullets[index])
+                    self.score += 25  # Deflected shots score like the player's own
+            self.remove_entities(group, spent)
+        self.remove_entities(self.obstacles, destroyed)
+
+    def destroy_obstacle(self, obstacle):
+        """Blow up an obstacle and drop it from the broadphase.
+
+        The caller removes it from ``self.obstacles``.
+        """
+        self.obstacle_grid.remove(obstacle)
+        self.explosions.append(self.spawn(Explosion, obstacle.x, obstacle.y))
+        self.audio.play('explosion')
+
+    def run_headless(self, max_ticks, policy=None, seed=None):
+        """Play one game without waiting on the clock; returns the ticks run.
+
+        ``policy`` is called with the game before every tick and returns the
+        events to feed to ``step``.
+        """
+        self.start_game(seed)
+        ticks = 0
+        while ticks < max_ticks and self.game_state != 'GAME_OVER':
+            inputs = policy(self) if policy else ()
+            self.step(inputs, render=False)
+            ticks += 1
+        self.save_recording()
+        return ticks
 
     def check_powerup_collision(self):
         for powerup in self.powerups[:]:
             powerup_rect = pygame.Rect(powerup.x, powerup.y, powerup.width, powerup.height)
-            if self.player.get_rect().colliderect(powerup_rect):
-                if self.assets['sounds'] and 'powerup' in self.assets['sounds']:
-                    self.assets['sounds']['powerup'].play()
+            if self.player.get_rect().colliderect(powerup_rect) and \
+               self.hits_car(self.assets['carimg'], self.player.x, self.player.y, powerup_rect):
+                self.audio.play('powerup')
                 self.powerups.remove(powerup)
+                self.release(powerup)
                 self.player.activate_powerup()
 
     def game_over_loop(self):
-        if self.assets['sounds']:
-            pygame.mixer.music.stop()
-            if hasattr(self, 'engine_channel'):
-                self.engine_channel.stop()
+        self.audio.stop()
 
-        if self.score > self.highscore:
-            self.highscore = self.score
-            self.save_highscore()
+        # Swarm scores aren't comparable with the normal game's.
+        if not self.swarm:
+            self.leaderboard.record(self.score, self.passed, self.level, self.game_time, self.seed)
+            self.highscore = self.leaderboard.best
+        self.save_recording()
+        if self.profiler.trace_path:
+            self.profiler.export_in_background()
 
         while self.game_state == 'GAME_OVER':
             for event in pygame.event.get():
@@ -391,91 +1987,115 @@ class Game:
                     if event.key == pygame.K_RETURN:
                         self.start_game()
 
-            self.gamedisplays.blit(self.assets['intro_background'], (0, 0))
+            self.draw_game_over()
+            pygame.display.update()
+            self.clock.tick(30)
 
-            font = pygame.font.SysFont(None, 40)
-            score_text = font.render("Score: " + str(self.score), True, BLACK)
-            self.gamedisplays.blit(score_text, (self.display_width / 2 - score_text.get_width() / 2, 50))
-            highscore_text = font.render("High Score: " + str(self.highscore), True, BLACK)
-            self.gamedisplays.blit(highscore_text, (self.display_width / 2 - highscore_text.get_width() / 2, 100))
+    def draw_leaderboard(self, y):
+        font = self.fonts.get(None, 28)
+        for rank, (score, passed, level, duration, _, _) in enumerate(self.leaderboard.top, 1):
+            line = f"{rank}. {score}"
+            # Runs carried over from highscore.txt have no details.
+            if level:
+                line += f"   level {level}, {passed} passed, {int(duration) // 60}:{int(duration) % 60:02d}"
+            text = self.fonts.render(line, font, BLACK)
+            self.gamedisplays.blit(text, (self.display_width / 2 - text.get_width() / 2, y))
+            y += 28
+
+    def draw_game_over(self):
+        self.gamedisplays.blit(self.assets['intro_background'], (0, 0))
+
+        font = self.fonts.get(None, 40)
+        score_text = self.fonts.render("Score: " + str(self.score), font, BLACK)
+        self.gamedisplays.blit(score_text, (self.display_width / 2 - score_text.get_width() / 2, 50))
+        highscore_text = self.fonts.render("High Score: " + str(self.highscore), font, BLACK)
+        self.gamedisplays.blit(highscore_text, (self.display_width / 2 - highscore_text.get_width() / 2, 100))
+        self.draw_leaderboard(150)
+
+        large_text = self.fonts.get('freesansbold.ttf', 115)
+        text_surf, text_rect = self.text_objects("GAME OVER", large_text)
+        text_rect.center = (self.display_width / 2, self.display_height / 2)
+        self.gamedisplays.blit(text_surf, text_rect)
 
-            large_text = pygame.font.Font('freesansbold.ttf', 115)
-            text_surf, text_rect = self.text_objects("GAME OVER", large_text)
-            text_rect.center = (self.display_width / 2, self.display_height / 2)
-            self.gamedisplays.blit(text_surf, text_rect)
+        self.button("RESTART", 150, 450, 150, 50, GREEN, BRIGHT_GREEN, self.start_game)
+        self.button("MAIN MENU", 550, 450, 200, 50, RED, BRIGHT_RED, self.back_to_menu)
 
+    def handle_crash(self):
+        self.audio.stop(music=False)
+        self.audio.play('crash')
 
-            self.button("RESTART", 150, 450, 150, 50, GREEN, BRIGHT_GREEN, self.start_game)
-            self.button("MAIN MENU", 550, 450, 200, 50, RED, BRIGHT_RED, self.back_to_menu)
+        self.lose_life('crash')
 
-            pygame.display.update()
-            self.clock.tick(30)
+        if self.game_state != 'GAME_OVER':
+            self.enter_timed_state('CRASHED')
 
-    def handle_crash(self):
-        if self.assets['sounds']:
-            if hasattr(self, 'engine_channel'):
-                self.engine_channel.stop()
-            self.assets['sounds']['crash'].play()
+    def crashed_loop(self):
+        self.timed_loop(self.draw_crashed)
 
-        self.lose_life()
+    def draw_crashed(self):
+        self.draw_frame()
+        large_text = self.fonts.get('freesansbold.ttf', 80)
+        text_surf, text_rect = self.text_objects("YOU CRASHED", large_text)
+        text_rect.center = (self.display_width / 2, self.display_height / 2)
+        self.gamedisplays.blit(text_surf, text_rect)
 
-        if self.game_state != 'GAME_OVER':
-            large_text = pygame.font.Font('freesansbold.ttf', 80)
-            text_surf, text_rect = self.text_objects("YOU CRASHED", large_text)
-            text_rect.center = (self.display_width / 2, self.display_height / 2)
-            self.gamedisplays.blit(text_surf, text_rect)
-            pygame.display.update()
-            time.sleep(2)
-            self.player = Player(self)
-            self.obstacles = [Obstacle(self)]
-            self.game_state = 'PLAYING'
-            if self.assets['sounds']:
-                self.engine_channel.play(self.assets['sounds']['engine'], -1)
+    def respawn(self):
+        self.timers.cancel(self.player.power_up_timer)
+        self.player = Player(self)
+        if self.swarm:
+            # The swarm starts over from a fresh row.
+            self.timers.cancel(self.swarm_timer)
+            self.obstacles = self.new_group()
+            self.spawn_swarm_row()
+        else:
+            self.obstacles = self.new_group([self.obstacle_class(self)])
+        self.game_state = 'PLAYING'
 
     def handle_player_hit_by_bullet(self):
-        self.explosions.append(Explosion(self, self.player.x, self.player.y))
-        if self.assets['sounds'] and 'explosion' in self.assets['sounds']:
-            self.assets['sounds']['explosion'].play()
-        self.lose_life()
+        self.explosions.append(self.spawn(Explosion, self.player.x, self.player.y))
+        self.audio.play('explosion')
+        self.lose_life('shot')
 
-    def lose_life(self):
+    def lose_life(self, cause):
         self.lives -= 1
+        self.lives_lost += 1
         if self.lives <= 0:
+            self.death_cause = cause
             self.game_state = 'GAME_OVER'
 
-    def start_game(self):
-        self.new_game()
-        self.game_state = 'COUNTDOWN'
-        if self.assets['sounds']:
-            pygame.mixer.music.play(-1)
+    def start_game(self, seed=None, swarm=None):
+        # Hand the last game's pooled entities back before starting over.
+        for group in (self.bullets, self.enemy_bullets, self.explosions, self.powerups):
+            for entity in list(group):
+                self.release(entity)
+        self.save_recording()
+        if swarm is not None:
+            self.set_swarm(swarm)
+        self.new_game(seed)
+        if self.record_path:
+            self.recording = InputRecording(self.seed, self.tick_rate, self.entity_arrays, self.swarm)
+        self.audio.start_music()
+        self.countdown_label = None
+        self.enter_timed_state('COUNTDOWN')
 
     def countdown_loop(self):
-        self.gamedisplays.fill(GRAY)
-        self.draw_background()
+        self.timed_loop(self.draw_countdown)
+
+    def draw_countdown(self):
+        # 3, 2, 1 and GO!!! each get a quarter of the countdown.
+        duration = self.transition_seconds['COUNTDOWN']
+        quarter = int(self.state_time * 4 / duration) if duration else 3
+        label = str(3 - quarter) if quarter < 3 else "GO!!!"
+        if label != self.countdown_label:
+            self.countdown_label = label
+            sound = 'go' if quarter >= 3 else 'beep'
+            self.audio.play(sound)
 
-        countdown_font = pygame.font.Font('freesansbold.ttf', 115)
-        for i in range(3, 0, -1):
-            self.gamedisplays.fill(GRAY)
-            self.draw_background()
-            text_surf, text_rect = self.text_objects(str(i), countdown_font)
-            text_rect.center = (self.display_width / 2, self.display_height / 2)
-            self.gamedisplays.blit(text_surf, text_rect)
-            if self.assets['sounds']:
-                self.assets['sounds']['beep'].play()
-            pygame.display.update()
-            time.sleep(1)
-
-        self.gamedisplays.fill(GRAY)
         self.draw_background()
-        text_surf, text_rect = self.text_objects("GO!!!", countdown_font)
+        countdown_font = self.fonts.get('freesansbold.ttf', 115)
+        text_surf, text_rect = self.text_objects(label, countdown_font)
         text_rect.center = (self.display_width / 2, self.display_height / 2)
         self.gamedisplays.blit(text_surf, text_rect)
-        if self.assets['sounds']:
-            self.assets['sounds']['go'].play()
-        pygame.display.update()
-        time.sleep(1)
-
-        self.game_state = 'PLAYING'
 
     def show_instructions(self):
         self.game_state = 'INSTRUCTIONS'
@@ -483,7 +2103,21 @@ class Game:
     def back_to_menu(self):
         self.game_state = 'INTRO'
 
+    def save_recording(self):
+        if self.recording:
+            self.recording.save(self.recording_path(self.recording.seed))
+            self.recording = None
+
+    def recording_path(self, seed):
+        """Where the game with ``seed`` is recorded: record_path with the seed added to the name."""
+        root, ext = os.path.splitext(self.record_path)
+        return f"{root}-{seed}{ext}"
+
     def quit_game(self):
+        self.save_recording()
+        self.leaderboard.close()
+        if self.profiler.trace_path:
+            self.profiler.export()
         pygame.quit()
         sys.exit()
 
@@ -498,53 +2132,74 @@ class Game:
         else:
             pygame.draw.rect(self.gamedisplays, ic, (x, y, w, h))
 
-        small_text = pygame.font.Font("freesansbold.ttf", 20)
+        small_text = self.fonts.get('freesansbold.ttf', 20)
         text_surf, text_rect = self.text_objects(msg, small_text)
         text_rect.center = ((x + (w / 2)), (y + (h / 2)))
         self.gamedisplays.blit(text_surf, text_rect)
+        return pygame.Rect(x, y, w, h)
 
     def text_objects(self, text, font):
-        text_surface = font.render(text, True, BLACK)
+        text_surface = self.fonts.render(text, font, BLACK)
         return text_surface, text_surface.get_rect()
 
     def display_hud(self, speed_offset):
-        font = pygame.font.SysFont(None, 25)
-
-        passed_text = font.render("Passed: " + str(self.passed), True, BLACK)
-        self.gamedisplays.blit(passed_text, (0, 50))
-
-        score_text = font.render("Score: " + str(self.score), True, RED)
-        self.gamedisplays.blit(score_text, (0, 30))
-
-        lives_text = font.render("Lives: " + str(self.lives), True, BLACK)
-        self.gamedisplays.blit(lives_text, (0, 70))
-
-        highscore_text = font.render("High Score: " + str(self.highscore), True, BLACK)
-        self.gamedisplays.blit(highscore_text, (0, 90))
-
-        if self.player.shield_hits > 4:
+        """Draw the HUD and return the rects it covered.
+
+        The text and the speedometer are drawn into cached surfaces that are
+        only redrawn when a figure changes; below full quality the figures
+        only catch up every HUD_REFRESH_FRAMES frames.
+        """
+        refresh = self.hud_frame % self.governor.hud_interval == 0
+        self.hud_frame += 1
+        values = (self.passed, self.score, self.lives, self.highscore, self.player.shield_hits)
+        if self.hud_values is None or (refresh and values != self.hud_values):
+            self.hud_values = values
+            self.draw_hud_text(*values)
+        if self.hud_speed is None or (refresh and speed_offset != self.hud_speed):
+            self.hud_speed = speed_offset
+            self.speedometer.fill((0, 0, 0, 0))
+            self.draw_dial(self.speedometer, SPEEDOMETER_SIZE // 2, SPEEDOMETER_SIZE // 2, speed_offset)
+
+        x = self.display_width - 100 - SPEEDOMETER_SIZE // 2
+        y = 100 - SPEEDOMETER_SIZE // 2
+        return [self.gamedisplays.blit(self.hud_text, HUD_TEXT_POS), self.gamedisplays.blit(self.speedometer, (x, y))]
+
+    def draw_hud_text(self, passed, score, lives, highscore, shield_hits):
+        surface = self.hud_text
+        surface.fill((0, 0, 0, 0))
+        font = self.fonts.get(None, 25)
+
+        score_text = self.fonts.render("Score: " + str(score), font, RED)
+        surface.blit(score_text, (0, 0))
+
+        passed_text = self.fonts.render("Passed: " + str(passed), font, BLACK)
+        surface.blit(passed_text, (0, 20))
+
+        lives_text = self.fonts.render("Lives: " + str(lives), font, BLACK)
+        surface.blit(lives_text, (0, 40))
+
+        highscore_text = self.fonts.render("High Score: " + str(highscore), font, BLACK)
+        surface.blit(highscore_text, (0, 60))
+
+        if shield_hits > 4:
             shield_color = (0, 255, 255)  # Cyan
-        elif self.player.shield_hits > 2:
+        elif shield_hits > 2:
             shield_color = YELLOW
         else:
             shield_color = RED
 
-        if self.player.shield_hits > 0:
-            shield_text = font.render("Shield Hits: " + str(self.player.shield_hits), True, shield_color)
-            self.gamedisplays.blit(shield_text, (0, 110))
-
-        self.draw_speedometer(speed_offset)
+        if shield_hits > 0:
+            shield_text = self.fonts.render("Shield Hits: " + str(shield_hits), font, shield_color)
+            surface.blit(shield_text, (0, 80))
 
-    def draw_speedometer(self, speed_offset):
-        x = self.display_width - 100
-        y = 100
+    def draw_dial(self, surface, x, y, speed_offset):
         radius = 50
 
         base_speed = 9
         speed = base_speed + speed_offset
 
         # Draw the speedometer arc
-        pygame.draw.arc(self.gamedisplays, BLACK, (x - radius, y - radius, radius * 2, radius * 2), math.pi, 2 * math.pi, 3)
+        dial = pygame.draw.arc(surface, BLACK, (x - radius, y - radius, radius * 2, radius * 2), math.pi, 2 * math.pi, 3)
 
         # Draw the needle
         angle = math.pi + (speed / 30) * math.pi
@@ -555,97 +2210,175 @@ class Game:
 
         end_x = x + radius * math.cos(angle)
         end_y = y + radius * math.sin(angle)
-        pygame.draw.line(self.gamedisplays, RED, (x, y), (end_x, end_y), 3)
+        pygame.draw.line(surface, RED, (x, y), (end_x, end_y), 3)
 
-        font = pygame.font.SysFont(None, 25)
-        text = font.render("Mph", True, BLACK)
-        self.gamedisplays.blit(text, (x - text.get_width() // 2, y + 10))
+        font = self.fonts.get(None, 25)
+        text = self.fonts.render("Mph", font, BLACK)
+        dial.union_ip(surface.blit(text, (x - text.get_width() // 2, y + 10)))
 
         # Draw speed text
-        font = pygame.font.SysFont(None, 30)
-        speed_text = font.render(str(int(speed)), True, BLACK)
-        self.gamedisplays.blit(speed_text, (x - speed_text.get_width() // 2, y - speed_text.get_height() // 2))
+        font = self.fonts.get(None, 30)
+        speed_text = self.fonts.render(str(int(speed)), font, BLACK)
+        dial.union_ip(surface.blit(speed_text, (x - speed_text.get_width() // 2, y - speed_text.get_height() // 2)))
+        return dial
+
+    def scrolling_rects(self):
+        """Return the screen columns that change every frame as the road scrolls."""
+        height = self.display_height
+        verge_width = self.assets['backgroundpic'].get_width()
+        strip_width = self.assets['strip'].get_width()
+        return [
+            pygame.Rect(0, 0, verge_width, height),
+            pygame.Rect(700, 0, verge_width, height),
+            pygame.Rect(120, 0, strip_width, height),
+            pygame.Rect(680, 0, strip_width, height),
+            pygame.Rect(400, 0, self.assets['yellow_strip'].get_width(), height),
+        ]
+
+    def road_tiles(self):
+        """Return the pre-composited (road, lanes) scroll tiles.
+
+        The road tile holds the gray road and both verges and repeats every
+        verge height; the lanes tile holds the lane markings between x=120
+        and the right edge strip and repeats every yellow-strip height. Both
+        are at least a screen tall and are rebuilt only when the resolution
+        changes.
+        """
+        key = (self.display_width, self.display_height)
+        if self.road_tile_key != key:
+            verge = self.assets['backgroundpic']
+            yellow_strip = self.assets['yellow_strip']
+            strip = self.assets['strip']
+
+            period = verge.get_height()
+            road = pygame.Surface((self.display_width, period * math.ceil(self.display_height / period))).convert()
+            road.fill(GRAY)
+            for y in range(0, road.get_height(), period):
+                road.blit(verge, (0, y))
+                road.blit(verge, (700, y))
+
+            period = yellow_strip.get_height()
+            lanes = pygame.Surface((680 + strip.get_width() - LANES_LEFT, period * math.ceil(self.display_height / period))).convert()
+            lanes.fill(GRAY)
+            for y in range(0, lanes.get_height(), period):
+                lanes.blit(yellow_strip, (400 - LANES_LEFT, y))
+            for y in range(0, lanes.get_height(), strip.get_height()):
+                lanes.blit(strip, (120 - LANES_LEFT, y))
+                lanes.blit(strip, (680 - LANES_LEFT, y))
+
+            self.road_tile_key = key
+            self.road_tile = road
+            self.lanes_tile = lanes
+        return self.road_tile, self.lanes_tile
+
+    def background_sprites(self):
+        road, lanes = self.road_tiles()
+        background_y = self.prev_background_y + (self.background_y - self.prev_background_y) * self.render_alpha
+        road_y = background_y % road.get_height()
+        lanes_y = background_y % lanes.get_height()
+        return [(road, (0, road_y - road.get_height())), (road, (0, road_y)),
+                (lanes, (LANES_LEFT, lanes_y - lanes.get_height())), (lanes, (LANES_LEFT, lanes_y))]
 
     def draw_background(self):
-        self.gamedisplays.fill(GRAY)
-        rel_y = self.background_y % self.assets['backgroundpic'].get_rect().height
-        self.gamedisplays.blit(self.assets['backgroundpic'], (0, rel_y - self.assets['backgroundpic'].get_rect().height))
-        self.gamedisplays.blit(self.assets['backgroundpic'], (700, rel_y - self.assets['backgroundpic'].get_rect().height))
-        if rel_y < self.display_height:
-            self.gamedisplays.blit(self.assets['backgroundpic'], (0, rel_y))
-            self.gamedisplays.blit(self.assets['backgroundpic'], (700, rel_y))
-
-        # Draw strips
-        rel_y_strip = self.background_y % self.assets['yellow_strip'].get_rect().height
-        for i in range(-2, self.display_height // self.assets['yellow_strip'].get_rect().height + 2):
-            self.gamedisplays.blit(self.assets['yellow_strip'], (400, rel_y_strip + i * self.assets['yellow_strip'].get_rect().height))
-            self.gamedisplays.blit(self.assets['strip'], (120, rel_y_strip + i * self.assets['strip'].get_rect().height))
-            self.gamedisplays.blit(self.assets['strip'], (680, rel_y_strip + i * self.assets['strip'].get_rect().height))
+        self.gamedisplays.blits(self.background_sprites(), doreturn=False)
+
+    def hits_car(self, image, x, y, rect):
+        """Whether ``rect`` touches the car drawn from ``image`` at (x, y).
+
+        Only meant for rects already known to overlap the car's rect; the
+        border around the car doesn't count.
+        """
+        mask = self.assets['car_masks'].get(image)
+        if mask is None:
+            return True
+        rect_mask = self.rect_masks.get(rect.size)
+        if rect_mask is None:
+            rect_mask = self.rect_masks[rect.size] = pygame.Mask(rect.size, fill=True)
+        return mask.overlap(rect_mask, (rect.x - int(x), rect.y - int(y))) is not None
+
+    def cars_touch(self, obstacle):
+        """Whether the player's car and ``obstacle`` overlap, border excluded."""
+        masks = self.assets['car_masks']
+        player_mask = masks.get(self.assets['carimg'])
+        obstacle_mask = masks.get(obstacle.image)
+        if player_mask is None or obstacle_mask is None:
+            return True
+        offset = (int(obstacle.x) - int(self.player.x), int(obstacle.y) - int(self.player.y))
+        return player_mask.overlap(obstacle_mask, offset) is not None
 
     def check_crash(self):
-        for obstacle in self.obstacles[:]:
-            if self.player.get_rect().colliderect(obstacle.get_rect()):
-                if self.player.power_up_active:
-                    # Destroy the obstacle
-                    self.obstacles.remove(obstacle)
-                    self.explosions.append(Explosion(self, obstacle.x, obstacle.y))
-                    if self.assets['sounds'] and 'explosion' in self.assets['sounds']:
-                        self.assets['sounds']['explosion'].play()
-                    return False  # Player is invincible
-                elif self.player.shield_hits > 0:
-                    # Bounce effect
-                    self.player.shield_hits -= 2
-                    self.player.y += 10  # Move player back
-                    if self.player.shield_hits < 0:
-                        self.player.shield_hits = 0
-
-                    # Destroy the obstacle
-                    self.obstacles.remove(obstacle)
-                    self.explosions.append(Explosion(self, obstacle.x, obstacle.y))
-                    if self.assets['sounds'] and 'explosion' in self.assets['sounds']:
-                        self.assets['sounds']['explosion'].play()
-                    return False  # No game over crash
-                else:
-                    return True  # Real crash
+        for obstacle in self.obstacle_grid.query(self.player.get_rect()):
+            if not self.cars_touch(obstacle):
+                continue
+            if self.player.power_up_active:
+                # Destroy the obstacle
+                self.obstacles.remove(obstacle)
+                self.destroy_obstacle(obstacle)
+                return False  # Player is invincible
+            elif self.player.shield_hits > 0:
+                # Bounce effect
+                self.player.shield_hits -= 2
+                self.player.y += 10  # Move player back
+                if self.player.shield_hits < 0:
+                    self.player.shield_hits = 0
+
+                # Destroy the obstacle
+                self.obstacles.remove(obstacle)
+                self.destroy_obstacle(obstacle)
+                return False  # No game over crash
+            else:
+                return True  # Real crash
         return False
 
     def check_bullet_collisions(self):
-        for bullet in self.enemy_bullets[:]:  # Iterate over a copy
-            bullet_rect = pygame.Rect(bullet.x, bullet.y, bullet.width, bullet.height)
+        player_rect = self.player.get_rect()
+        front_shield_rect = self.player.get_front_shield_rect()
+        back_shield_rect = self.player.get_back_shield_rect()
+        zone = player_rect.unionall([rect for rect in (front_shield_rect, back_shield_rect) if rect])
+
+        carimg = self.assets['carimg']
+        spent = []
+        # One query per tick, so a plain scan beats bucketing the bullets.
+        bullets = list(self.enemy_bullets)
+        rects = [bullet.get_rect() for bullet in bullets]
+        for index in zone.collidelistall(rects):
+            bullet = bullets[index]
+            bullet_rect = rects[index]
+            hits_player = (player_rect.colliderect(bullet_rect)
+                           and self.hits_car(carimg, self.player.x, self.player.y, bullet_rect))
 
             # If player is powered up, they are invincible
-            if self.player.power_up_active and self.player.get_rect().colliderect(bullet_rect):
-                self.enemy_bullets.remove(bullet)
+            if self.player.power_up_active and hits_player:
+                spent.append(bullet)
                 continue
 
             # Check shield collision first
             if self.player.shield_hits > 0:
-                front_shield_rect = self.player.get_front_shield_rect()
-                back_shield_rect = self.player.get_back_shield_rect()
-
-                collided_with_shield = False
-                if front_shield_rect and bullet_rect.colliderect(front_shield_rect):
-                    self.enemy_bullets.remove(bullet)
+                if (front_shield_rect and bullet_rect.colliderect(front_shield_rect)) or \
+                   (back_shield_rect and bullet_rect.colliderect(back_shield_rect)):
+                    spent.append(bullet)
                     self.player.shield_hits -= 1
-                    collided_with_shield = True
-                elif back_shield_rect and bullet_rect.colliderect(back_shield_rect):
-                    self.enemy_bullets.remove(bullet)
-                    self.player.shield_hits -= 1
-                    collided_with_shield = True
-
-                if collided_with_shield:
                     continue  # Bullet is handled, don't check for player collision
 
             # Check player collision
-            player_rect = self.player.get_rect()
-            if player_rect.colliderect(bullet_rect):
-                self.enemy_bullets.remove(bullet)
+            if hits_player:
+                spent.append(bullet)
                 self.handle_player_hit_by_bullet()
                 # break from loop since player is hit.
                 break
 
-class Bullet:
+        self.remove_entities(self.enemy_bullets, spent)
+
+class Bullet(StoredEntity, Interpolated):
+    __slots__ = ('game', 'x', 'y', 'prev_x', 'prev_y', 'speed_x', 'speed_y', 'width', 'height', 'color', 'image')
+    STORED = {'x': 'x', 'y': 'y', 'prev_x': 'px', 'prev_y': 'py', 'speed_x': 'vx', 'speed_y': 'vy'}
+    _images = {}
+
     def __init__(self, game, x, y, speed_x=0, speed_y=-10):
+        self.reset(game, x, y, speed_x, speed_y)
+
+    def reset(self, game, x, y, speed_x=0, speed_y=-10):
+        self._store = None
         self.game = game
         self.x = x
         self.y = y
@@ -654,60 +2387,106 @@ class Bullet:
         self.width = 4
         self.height = 10
         self.color = (255, 255, 0) # Yellow
+        self.image = self.solid_image()
+        self.snapshot()
+
+    def solid_image(self):
+        """A filled surface of the bullet's size and colour, shared by all such bullets."""
+        key = (self.width, self.height, self.color)
+        image = Bullet._images.get(key)
+        if image is None:
+            image = pygame.Surface((self.width, self.height)).convert()
+            image.fill(self.color)
+            Bullet._images[key] = image
+        return image
+
+    def get_rect(self):
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    def on_screen(self):
+        return self.y > 0
 
     def update(self):
-        self.x += self.speed_x
-        self.y += self.speed_y
+        scale = self.game.tick_scale
+        self.x += self.speed_x * scale
+        self.y += self.speed_y * scale
+
+    @staticmethod
+    def update_batch(game, store):
+        x = store.view('x')
+        y = store.view('y')
+        x += store.view('vx') * game.tick_scale
+        y += store.view('vy') * game.tick_scale
 
-    def draw(self):
-        pygame.draw.rect(self.game.gamedisplays, self.color, (self.x, self.y, self.width, self.height))
 
 class EnemyBullet(Bullet):
+    __slots__ = ('deflected',)
+
     def __init__(self, game, x, y, speed_x, speed_y):
-        super().__init__(game, x, y, speed_x, speed_y)
+        self.reset(game, x, y, speed_x, speed_y)
+
+    def reset(self, game, x, y, speed_x, speed_y):
+        super().reset(game, x, y, speed_x, speed_y)
         self.color = (255, 0, 0) # Red
+        self.image = self.solid_image()
         self.deflected = False
 
+    def on_screen(self):
+        # Cars fire once they are past the player, so bullets that miss can
+        # leave by any edge.
+        return 0 < self.x < self.game.display_width and 0 < self.y < self.game.display_height
+
 class Explosion:
+    __slots__ = ('game', 'x', 'y', 'image')
+
     def __init__(self, game, x, y):
+        self.reset(game, x, y)
+
+    def reset(self, game, x, y):
         self.game = game
         self.x = x
         self.y = y
         self.image = self.game.assets.get('boom')
-        self.lifetime = 0.5 # seconds
-        self.spawn_time = time.time()
-
-    def update(self):
-        if time.time() - self.spawn_time > self.lifetime:
-            self.game.explosions.remove(self)
+        game.timers.schedule(EXPLOSION_SECONDS, game.expire_explosion, self)
 
-    def draw(self):
-        if self.image:
-            self.game.gamedisplays.blit(self.image, (self.x, self.y))
+class PowerUp(StoredEntity, Interpolated):
+    __slots__ = ('game', 'x', 'y', 'prev_x', 'prev_y', 'base_speed', 'width', 'height', 'image')
+    STORED = {'x': 'x', 'y': 'y', 'prev_x': 'px', 'prev_y': 'py', 'base_speed': 'vy'}
+    _images = {}
 
-class PowerUp:
     def __init__(self, game):
+        self.reset(game)
+
+    def reset(self, game):
+        self._store = None
         self.game = game
-        self.x = random.randrange(200, game.display_width - 200)
+        self.x = game.rng.randrange(200, game.display_width - 200)
         self.y = -600
         self.base_speed = 7
         self.width = 30
         self.height = 30
-        # Simple green rectangle for the power-up
-        self.image = pygame.Surface([self.width, self.height])
-        self.image.fill(GREEN)
+        # Simple green rectangle for the power-up, shared by all of them
+        self.image = PowerUp._images.get((self.width, self.height))
+        if self.image is None:
+            self.image = pygame.Surface([self.width, self.height])
+            self.image.fill(GREEN)
+            PowerUp._images[(self.width, self.height)] = self.image
+        self.snapshot()
+
+    def on_screen(self):
+        return self.y <= self.game.display_height
 
     def update(self):
-        self.y += self.base_speed + self.game.speed_offset
-        # Remove power-up if it goes off-screen
-        if self.y > self.game.display_height:
-            if self in self.game.powerups:
-                self.game.powerups.remove(self)
+        self.y += (self.base_speed + self.game.speed_offset) * self.game.tick_scale
 
-    def draw(self):
-        self.game.gamedisplays.blit(self.image, (self.x, self.y))
+    @staticmethod
+    def update_batch(game, store):
+        y = store.view('y')
+        y += (store.view('vy') + game.speed_offset) * game.tick_scale
+        for powerup in store.compact(y <= game.display_height):
+            game.release(powerup)
 
-class Player:
+class Player(Interpolated):
     def __init__(self, game):
         self.game = game
         # Center of road is 400. Car width is 56. 400 - (56/2) = 372
@@ -721,15 +2500,25 @@ class Player:
         self.shield_hits = 8
         self.is_accelerating = False
         self.power_up_active = False
-        self.power_up_end_time = 0
+        self.power_up_timer = None
+        self.snapshot()
 
     def activate_powerup(self):
         self.power_up_active = True
-        # Power-up duration: 7 seconds
-        self.power_up_end_time = time.time() + 7
+        # Another power-up restarts the clock
+        self.game.timers.cancel(self.power_up_timer)
+        self.power_up_timer = self.game.timers.schedule(POWERUP_SECONDS, self.expire_powerup)
         # Speed up to 25 Mph (base speed is 9)
         self.game.speed_offset = 16
 
+    def expire_powerup(self):
+        self.power_up_active = False
+        self.power_up_timer = None
+        # Return to 13 Mph
+        self.game.speed_offset = 4
+        # Restore shields to full
+        self.shield_hits = 8
+
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.width, self.height)
 
@@ -759,18 +2548,15 @@ class Player:
                 # ACCELERATION: Increase the speed offset to make obstacles move faster,
                 # creating the illusion of the player car accelerating.
                 self.game.speed_offset = min(10, self.game.speed_offset + 2)
-                if self.game.assets['sounds'] and 'engine2' in self.game.assets['sounds']:
-                    self.game.assets['sounds']['engine2'].play()
+                self.game.audio.play('engine2')
                 self.is_accelerating = True
             elif event.key == pygame.K_a:
                 # BRAKING: Decrease the speed offset to make obstacles move slower,
                 # creating the illusion of the player car braking.
                 self.game.speed_offset = max(-5, self.game.speed_offset - 2)
-                if self.game.assets['sounds'] and 'breaks' in self.game.assets['sounds']:
-                    self.game.assets['sounds']['breaks'].play()
+                self.game.audio.play('breaks')
             elif event.key == pygame.K_LSHIFT:
-                if self.game.assets['sounds']:
-                    self.game.assets['sounds']['horn'].play()
+                self.game.audio.play('horn')
             elif event.key == pygame.K_SPACE:
                 self.shoot()
         if event.type == pygame.KEYUP:
@@ -782,15 +2568,8 @@ class Player:
                 self.is_accelerating = False
 
     def update(self):
-        if self.power_up_active and time.time() > self.power_up_end_time:
-            self.power_up_active = False
-            # Return to 13 Mph
-            self.game.speed_offset = 4
-            # Restore shields to full
-            self.shield_hits = 8
-
-        self.x += self.x_change
-        self.y += self.y_change
+        self.x += self.x_change * self.game.tick_scale
+        self.y += self.y_change * self.game.tick_scale
         if self.x > 690 - self.width:
             self.x = 690 - self.width
         if self.x < 110:
@@ -801,48 +2580,54 @@ class Player:
             self.y = 0
 
     def shoot(self):
-        if self.game.assets['sounds'] and 'gun' in self.game.assets['sounds']:
-            self.game.assets['sounds']['gun'].play()
+        self.game.audio.play('gun')
 
         # Double bullets
-        bullet1 = Bullet(self.game, self.x + 10, self.y, speed_y=-10)
-        bullet2 = Bullet(self.game, self.x + CAR_WIDTH - 14, self.y, speed_y=-10)
+        bullet1 = self.game.spawn(Bullet, self.x + 10, self.y, speed_y=-10)
+        bullet2 = self.game.spawn(Bullet, self.x + CAR_WIDTH - 14, self.y, speed_y=-10)
         self.game.bullets.append(bullet1)
         self.game.bullets.append(bullet2)
 
     def get_red_car(self):
-        if not hasattr(self, 'red_car_image'):
-            self.red_car_image = self.game.assets['carimg'].copy()
-            red_surface = pygame.Surface(self.red_car_image.get_size(), pygame.SRCALPHA)
-            red_surface.fill((255, 0, 0, 128))
-            self.red_car_image.blit(red_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-        return self.red_car_image
+        # Shared by every Player, so respawning doesn't tint the car again.
+        return self.game.surfaces.derive('carimg (red)', self.tint_red)
+
+    def tint_red(self):
+        red_car_image = self.game.assets['carimg'].copy()
+        red_surface = pygame.Surface(red_car_image.get_size(), pygame.SRCALPHA)
+        red_surface.fill((255, 0, 0, 128))
+        red_car_image.blit(red_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+        return red_car_image
 
     def draw(self):
+        drawn = []
+        x, y = self.render_pos()
+        governor = self.game.governor
         car_to_draw = self.game.assets['carimg']
         if self.power_up_active:
             car_to_draw = self.get_red_car()
+        if self.power_up_active and governor.flames:
             # Super jet flame
-            flame_length = random.randint(30, 50)
+            flame_length = self.game.fx_rng.randint(30, 50)
             flame_color = (255, 69, 0)  # OrangeRed
             points = [
-                (self.x + self.width * 0.25, self.y + self.height),
-                (self.x + self.width * 0.75, self.y + self.height),
-                (self.x + self.width * 0.5, self.y + self.height + flame_length)
+                (x + self.width * 0.25, y + self.height),
+                (x + self.width * 0.75, y + self.height),
+                (x + self.width * 0.5, y + self.height + flame_length)
             ]
-            pygame.draw.polygon(self.game.gamedisplays, flame_color, points)
+            drawn.append(pygame.draw.polygon(self.game.gamedisplays, flame_color, points))
 
-        self.game.gamedisplays.blit(car_to_draw, (self.x, self.y))
+        car_rect = self.game.gamedisplays.blit(car_to_draw, (x, y))
 
-        if self.is_accelerating and not self.power_up_active:
-            flame_length = random.randint(15, 25)
+        if self.is_accelerating and not self.power_up_active and governor.flames:
+            flame_length = self.game.fx_rng.randint(15, 25)
             flame_color = (255, 165, 0)  # Orange
             points = [
-                (self.x + self.width * 0.25, self.y + self.height),
-                (self.x + self.width * 0.75, self.y + self.height),
-                (self.x + self.width * 0.5, self.y + self.height + flame_length)
+                (x + self.width * 0.25, y + self.height),
+                (x + self.width * 0.75, y + self.height),
+                (x + self.width * 0.5, y + self.height + flame_length)
             ]
-            pygame.draw.polygon(self.game.gamedisplays, flame_color, points)
+            drawn.append(pygame.draw.polygon(self.game.gamedisplays, flame_color, points))
         if self.shield_hits > 0:
             if self.shield_hits > 4:
                 shield_color = (0, 255, 255)  # Cyan
@@ -851,59 +2636,99 @@ class Player:
             else:
                 shield_color = RED
             shield_thickness = 4
-            # Curved front shield
-            front_arc_rect = pygame.Rect(self.x - 10, self.y - 15, self.width + 20, 30)
-            pygame.draw.arc(self.game.gamedisplays, shield_color, front_arc_rect, 0, math.pi, shield_thickness)
-            # Curved back shield
-            back_arc_rect = pygame.Rect(self.x - 10, self.y + self.height - 15, self.width + 20, 30)
-            pygame.draw.arc(self.game.gamedisplays, shield_color, back_arc_rect, math.pi, 2 * math.pi, shield_thickness)
-
-class Obstacle:
-    def __init__(self, game):
+            if governor.shield_arcs:
+                # Curved front shield
+                front_arc_rect = pygame.Rect(x - 10, y - 15, self.width + 20, 30)
+                drawn.append(pygame.draw.arc(self.game.gamedisplays, shield_color, front_arc_rect, 0, math.pi, shield_thickness))
+                # Curved back shield
+                back_arc_rect = pygame.Rect(x - 10, y + self.height - 15, self.width + 20, 30)
+                drawn.append(pygame.draw.arc(self.game.gamedisplays, shield_color, back_arc_rect, math.pi, 2 * math.pi, shield_thickness))
+            else:
+                # Straight bars in place of the arcs at minimal quality
+                drawn.append(pygame.draw.line(self.game.gamedisplays, shield_color, (x - 10, y - 15),
+                                              (x + self.width + 10, y - 15), shield_thickness))
+                drawn.append(pygame.draw.line(self.game.gamedisplays, shield_color, (x - 10, y + self.height + 15),
+                                              (x + self.width + 10, y + self.height + 15), shield_thickness))
+        return car_rect.unionall(drawn)
+
+class Obstacle(StoredEntity, Interpolated):
+    STORED = {'x': 'x', 'y': 'y', 'prev_x': 'px', 'prev_y': 'py', 'x_change': 'vx', 'base_speed': 'vy',
+              'width': 'w', 'has_fired': 'flag'}
+
+    def __init__(self, game, x=None):
+        self._store = None
         self.game = game
-        self.x = random.randrange(200, (game.display_width - 200))
+        self.x = game.rng.randrange(200, (game.display_width - 200)) if x is None else x
         self.y = -600
-        self.base_speed = (5 + (game.level - 1) * 1) + random.choice([0, 1, 2])
-        self.x_change = random.choice([-1, 1])
-        self.image = random.choice(self.game.assets['obstacle_cars'])
+        self.base_speed = (5 + (game.level - 1) * 1) + game.rng.choice([0, 1, 2])
+        self.x_change = game.rng.choice([-1, 1])
+        self.image = game.rng.choice(self.game.assets['obstacle_cars'])
         self.width = self.image.get_width()
         self.height = self.image.get_height()
         self.has_fired = False
+        self.snapshot()
 
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.width, self.height)
 
     def update(self):
-        self.y += self.base_speed + self.game.speed_offset
-        self.x += self.x_change
+        scale = self.game.tick_scale
+        self.y += (self.base_speed + self.game.speed_offset) * scale
+        self.x += self.x_change * scale
 
         if self.x < 110 or self.x > 690 - self.width:
             self.x_change *= -1
 
-        if self.game.level >= 2 and not self.has_fired and self.y > self.game.player.y:
-            if random.random() < 0.5:  # 50% chance to shoot
-                self.shoot()
-            self.has_fired = True
+        self.after_move()
+
+    def after_move(self):
+        """Fire once past the player, and recycle once off the screen.
+
+        Both draw from game.rng, so cars must take their turn in group order.
+        """
+        if self.game.level >= self.game.fire_level and not self.has_fired and self.y > self.game.player.y:
+            self.fire_once()
 
         if self.y > self.game.display_height:
-            self.y = -self.height
-            self.x = random.randrange(170, (self.game.display_width - 170))
-            self.image = random.choice(self.game.assets['obstacle_cars'])
-            self.base_speed = (5 + (game.level - 1) * 1) + random.choice([0, 1, 2])
-            self.game.passed += 1
-            self.has_fired = False
-            self.game.score = self.game.passed * 10
-
-            if self.game.score >= self.game.next_life_milestone:
-                self.game.lives += 1
-                self.game.next_life_milestone += 500
-
-            if self.game.passed > 0 and self.game.passed % 50 == 0:
-                self.game.level += 1
-                self.game.game_state = 'LEVEL_UP'
+            self.recycle()
+
+    @staticmethod
+    def update_batch(game, store):
+        x = store.view('x')
+        y = store.view('y')
+        x_change = store.view('vx')
+        y += (store.view('vy') + game.speed_offset) * game.tick_scale
+        x += x_change * game.tick_scale
+        x_change[(x < 110) | (x > 690 - store.view('w'))] *= -1
+
+        # Only the few cars past the player or leaving the screen this frame
+        # need per-object work, done in index order as list mode does it.
+        busy = ((store.view('flag') == 0) & (y > game.player.y)) | (y > game.display_height)
+        for index in np.flatnonzero(busy):
+            store.entities[index].after_move()
+
+    def fire_once(self):
+        if self.game.rng.random() < 0.5:  # 50% chance to shoot
+            self.shoot()
+        self.has_fired = True
+
+    def recycle(self):
+        self.y = -self.height
+        self.x = self.game.rng.randrange(170, (self.game.display_width - 170))
+        self.image = self.game.rng.choice(self.game.assets['obstacle_cars'])
+        self.base_speed = (5 + (self.game.level - 1) * 1) + self.game.rng.choice([0, 1, 2])
+        self.game.passed += 1
+        self.has_fired = False
+        self.snapshot()  # Don't interpolate the jump back to the top
+        self.game.score = self.game.passed * 10
 
-    def draw(self):
-        self.game.gamedisplays.blit(self.image, (self.x, self.y))
+        if self.game.score >= self.game.next_life_milestone:
+            self.game.lives += 1
+            self.game.next_life_milestone += self.game.life_score()
+
+        if self.game.passed > 0 and self.game.passed % self.game.passes_per_level == 0:
+            self.game.level += 1
+            self.game.enter_timed_state('LEVEL_UP')
 
     def shoot(self):
         bullet_speed = 10
@@ -917,9 +2742,79 @@ class Obstacle:
         speed_x = (dx / dist) * bullet_speed
         speed_y = (dy / dist) * bullet_speed
 
-        bullet = EnemyBullet(self.game, self.x + self.width / 2 - 2, self.y + self.height, speed_x, speed_y)
+        bullet = self.game.spawn(EnemyBullet, self.x + self.width / 2 - 2, self.y + self.height, speed_x, speed_y)
         self.game.enemy_bullets.append(bullet)
 
+def replay(path):
+    """Play an input recording back in a headless game and return the game."""
+    recording = InputRecording.load(path)
+    game = Game(headless=True, entity_arrays=recording.entity_arrays, tick_rate=recording.tick_rate,
+                swarm=recording.swarm)
+    game.start_game(recording.seed)
+    for events in recording.inputs():
+        game.step(events, render=False)
+    return game
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Road Rage")
+    parser.add_argument('--headless', type=int, metavar='TICKS',
+                        help="simulate up to TICKS ticks without a window and report the tick rate")
+    parser.add_argument('--entity-arrays', action='store_true',
+                        help="keep obstacles, bullets and power-ups in NumPy arrays")
+    parser.add_argument('--swarm', action='store_true',
+                        help="play swarm mode: rows of dozens to hundreds of shooting cars")
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help="only push the changed parts of the screen to the window "
+                             "(only when the window can't be scaled)")
+    parser.add_argument('--fixed-quality', action='store_true',
+                        help="keep every effect on however long frames take")
+    parser.add_argument('--tick-rate', type=int, default=TICK_RATE,
+                        help="simulation ticks per second (default: %(default)s)")
+    parser.add_argument('--max-fps', type=int, default=MAX_FPS,
+                        help="render frame cap, 0 for uncapped (default: %(default)s)")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="profile gameplay frames and write a Chrome trace to FILE (F3 shows the overlay)")
+    parser.add_argument('--seed', type=int,
+                        help="seed for the sequence of game seeds")
+    parser.add_argument('--record', metavar='FILE',
+                        help="record each game's input for replay, to FILE with the game's seed added "
+                             "to the name (run.rrin becomes run-<seed>.rrin)")
+    parser.add_argument('--replay', metavar='FILE',
+                        help="replay a recording headlessly and print the result")
+    parser.add_argument('--asset-report', action='store_true',
+                        help="load every image and print the memory each surface takes")
+    args = parser.parse_args(argv)
+    if args.tick_rate < 1:
+        parser.error("--tick-rate must be at least 1")
+    return args
+
 if __name__ == '__main__':
-    game = Game()
-    game.run()
+    args = parse_args()
+    if args.asset_report:
+        game = Game(headless=True)
+        for key in list(game.assets):
+            game.assets.get(key)
+        game.new_game()
+        game.player.get_red_car()
+        total = 0
+        for name, size, nbytes in game.surfaces.report():
+            print(f"{name:>32} {size[0]:>5}x{size[1]:<5} {nbytes / 1024:8.1f} KiB")
+            total += nbytes
+        print(f"{'total':>32} {'':11} {total / 1024:8.1f} KiB")
+    elif args.replay:
+        game = replay(args.replay)
+        print(f"seed {game.seed}: score {game.score}, passed {game.passed}, level {game.level}, "
+              f"lives {game.lives}, {game.game_state}")
+    elif args.headless:
+        game = Game(headless=True, entity_arrays=args.entity_arrays, seed=args.seed, record_path=args.record,
+                    swarm=args.swarm)
+        start = time.perf_counter()
+        ticks = game.run_headless(args.headless)
+        elapsed = time.perf_counter() - start
+        print(f"{ticks} ticks in {elapsed:.2f}s ({ticks / elapsed:.0f} ticks/s)")
+    else:
+        game = Game(entity_arrays=args.entity_arrays, dirty_rects=args.dirty_rects,
+                    tick_rate=args.tick_rate, max_fps=args.max_fps, seed=args.seed, record_path=args.record,
+                    profile_path=args.profile, swarm=args.swarm,
+                    adaptive_quality=not args.fixed_quality)
+        game.run()
@@ -0,0 +1,48 @@
+import os
+import shutil
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+import pygame
+
+import main
+from main import AssetPipeline
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def cache_entries(cache_dir):
+    return sorted(name for name in os.listdir(cache_dir) if name != AssetPipeline.INDEX)
+
+
+def test_sources_are_only_hashed_again_when_they_change(tmp_path, monkeypatch):
+    source = tmp_path / 'car.jpg'
+    shutil.copy(os.path.join(ROOT, 'car1.jpg'), source)
+    cache_dir = str(tmp_path / 'cache')
+    hashed = []
+    sha1 = main.hashlib.sha1
+    monkeypatch.setattr(main.hashlib, 'sha1', lambda data: hashed.append(data) or sha1(data))
+
+    AssetPipeline(cache_dir).decode(str(source))
+    first = cache_entries(cache_dir)
+    assert len(first) == 1 and len(hashed) == 1
+
+    # A new pipeline, as on the next startup, trusts the unchanged file's size and mtime.
+    AssetPipeline(cache_dir).decode(str(source))
+    assert cache_entries(cache_dir) == first and len(hashed) == 1
+
+    # Changing the source replaces its entry instead of leaving the old one behind.
+    shutil.copy(os.path.join(ROOT, 'car2.jpg'), source)
+    surface = AssetPipeline(cache_dir).decode(str(source))
+    assert surface.get_size() == pygame.image.load(os.path.join(ROOT, 'car2.jpg')).get_size()
+    second = cache_entries(cache_dir)
+    assert len(second) == 1 and second != first and len(hashed) == 2
+
+
+def test_entries_of_removed_sources_are_deleted(tmp_path):
+    source = tmp_path / 'car.jpg'
+    shutil.copy(os.path.join(ROOT, 'car1.jpg'), source)
+    cache_dir = str(tmp_path / 'cache')
+    AssetPipeline(cache_dir).decode(str(source))
+    source.unlink()
+    AssetPipeline(cache_dir)
+    assert cache_entries(cache_dir) == []
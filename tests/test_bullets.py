@@ -0,0 +1,25 @@
+import os
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+import pytest
+
+from main import EnemyBullet, Game
+
+
+@pytest.mark.parametrize('entity_arrays', [False, True])
+@pytest.mark.parametrize('x, y, speed_x, speed_y', [
+    (400, 5, 0, -10),
+    (5, 100, -10, 0),
+    (795, 100, 10, 0),
+    (400, 795, 0, 10),
+])
+def test_enemy_bullets_leaving_by_any_edge_go_back_to_the_pool(entity_arrays, x, y, speed_x, speed_y):
+    game = Game(headless=True, entity_arrays=entity_arrays)
+    game.start_game(seed=1)
+    game.update()
+    pool = game.pools[EnemyBullet]
+    free = len(pool.free)
+    game.enemy_bullets.append(game.spawn(EnemyBullet, x, y, speed_x, speed_y))
+    game.update()
+    assert len(game.enemy_bullets) == 0
+    assert len(pool.free) == free
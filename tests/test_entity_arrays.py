@@ -0,0 +1,25 @@
+import os
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+import pytest
+
+pytest.importorskip('numpy')
+
+from batch_sim import DodgePolicy, RandomPolicy
+from main import Game
+
+
+@pytest.mark.parametrize('policy, seed, swarm', [
+    (RandomPolicy, 11, False),
+    (DodgePolicy, 3, False),
+    (RandomPolicy, 7, False),
+    (DodgePolicy, 5, True),
+])
+def test_entity_arrays_play_the_same_game(policy, seed, swarm):
+    # Entity arrays are only a speed-up; the game they play must not change.
+    results = []
+    for entity_arrays in (False, True):
+        game = Game(headless=True, entity_arrays=entity_arrays, swarm=swarm)
+        ticks = game.run_headless(30000, policy(seed), seed=seed)
+        results.append((ticks, game.score, game.passed, game.level, game.lives_lost, game.game_state))
+    assert results[0] == results[1]
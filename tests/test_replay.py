@@ -0,0 +1,38 @@
+import os
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+import pytest
+
+from batch_sim import DodgePolicy, RandomPolicy
+from main import Game, SWARM_LANES, TRANSITION_SECONDS, replay
+
+
+@pytest.mark.parametrize('policy, seed', [(DodgePolicy, 24), (RandomPolicy, 48)])
+def test_replay_matches_game_with_timed_screens(tmp_path, policy, seed):
+    # The recorded game sits through the real countdown, crash and level-up
+    # screens while the headless replay skips them; both must end the same.
+    game = Game(headless=True, transition_seconds=TRANSITION_SECONDS, record_path=str(tmp_path / 'game.rrin'))
+    game.run_headless(30000, policy(seed), seed=seed)
+    replayed = replay(game.recording_path(seed))
+
+    result = lambda g: (g.score, g.passed, g.level, g.lives, g.game_state)
+    assert result(replayed) == result(game)
+
+
+def test_every_game_is_recorded(tmp_path):
+    game = Game(headless=True, record_path=str(tmp_path / 'run.rrin'))
+    for seed in (1, 2):
+        game.run_headless(100, seed=seed)
+    assert sorted(os.listdir(tmp_path)) == ['run-1.rrin', 'run-2.rrin']
+    assert replay(str(tmp_path / 'run-1.rrin')).seed == 1
+
+
+def test_swarm_respawns_a_row():
+    game = Game(headless=True, swarm=True)
+    game.start_game(seed=3)
+    game.handle_crash()
+    game.update()
+    assert game.lives_lost == 1
+    assert len(game.obstacles) == SWARM_LANES - 1
+    # The pending row was cancelled, so rows keep their usual pace.
+    assert sum(1 for timer in game.timers.heap if timer[2] == game.spawn_swarm_row) == 1
@@ -0,0 +1,25 @@
+import os
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+import pytest
+
+from main import Game, parse_args
+
+
+def test_game_runs_at_the_same_pace_at_any_tick_rate():
+    # One game-second of play moves the road and the first car just as far.
+    moved = []
+    for tick_rate in (60, 120):
+        game = Game(headless=True, tick_rate=tick_rate)
+        game.start_game(seed=1)
+        obstacle = game.obstacles[0]
+        start = obstacle.y
+        for _ in range(tick_rate):
+            game.update()
+        moved.append((game.game_time, game.background_y, obstacle.y - start))
+    assert moved[0] == pytest.approx(moved[1])
+
+
+def test_tick_rate_must_be_positive():
+    with pytest.raises(SystemExit):
+        parse_args(['--tick-rate', '0'])